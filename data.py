@@ -2,6 +2,10 @@
 #%%
 import pandas as pd
 import numpy as np
+from contextlib import nullcontext
+import hashlib
+import os
+import time
 from sqlalchemy import create_engine, text
 import matplotlib.pyplot as plt
 
@@ -9,6 +13,11 @@ import matplotlib.pyplot as plt
 driver = 'ODBC Driver 17 for SQL Server'
 server = 'PRODSVCREPORT70'
 db = 'CAG_Analyse'
+fetch_batch_groesse = 10000
+vorschau_zeilen = 1000      # TOP (:n) - nur fuer die Vorschau in diesem Skript
+erfasst_vor_tagen = 7
+cache_verzeichnis = '.cache'
+cache_max_alter_stunden = 24
 
 ### Hilfsfunktionen
 def conn_string_sql_alchemy(server, db, driver):
@@ -17,9 +26,11 @@ def conn_string_sql_alchemy(server, db, driver):
     
 def erzeuge_engine_von_conn_string_sql_alchemy(conn_string):
     try:
-        engine = create_engine(conn_string)
+        # fast_executemany: pyodbc nutzt Parameter-Arrays statt Einzelzeilen (z.B. fuer to_sql)
+        # Pool haelt Verbindungen offen; pre_ping prueft sie vor der Wiederverwendung
+        engine = create_engine(conn_string, fast_executemany=True, pool_size=4, pool_pre_ping=True)
         with engine.connect() as conn:
-            print("")
+            conn.execute(text("SELECT 1"))
         return engine
     except Exception as e:
         print(f"Es gab einen Fehler beim Verbinden: {e}")
@@ -28,17 +39,63 @@ def erzeuge_engine_von_conn_string_sql_alchemy(conn_string):
 def schliess_engine(engine):
     engine.dispose()
 
-def lade_daten(engine,query):
-    query_resultat = pd.DataFrame(engine.connect().execute(text(query)))
+def lade_daten_chunks(engine,query,params=None,conn=None,chunksize=None):
+    # Generator: read_sql_query liest serverseitig gestreamt, ein DataFrame pro Chunk
+    # Eine uebergebene Verbindung wird wiederverwendet und nicht geschlossen
+    chunksize = chunksize or fetch_batch_groesse
+    with (nullcontext(conn) if conn is not None else engine.connect()) as verbindung:
+        verbindung = verbindung.execution_options(stream_results=True, yield_per=chunksize)
+        yield from pd.read_sql_query(text(query), verbindung, params=params or {},
+                                     chunksize=chunksize, coerce_float=True)
+
+def lade_daten(engine,query,params=None,conn=None):
+    # Chunks direkt als DataFrames (keine Zwischenliste aus Row-Tupeln), am Schluss zusammengefuegt
+    teile = list(lade_daten_chunks(engine,query,params,conn=conn))
+    if len(teile) == 1:
+        return teile[0]
+    query_resultat = pd.concat(teile, ignore_index=True)
+    return query_resultat
+
+def lade_daten_gecached(engine,query,params=None,conn=None):
+    # Resultat als Pickle auf Disk, Schluessel = Query-Text + Parameter; spart den DB-Roundtrip bei Wiederholungen
+    schluessel = hashlib.sha1(repr((query, sorted((params or {}).items()))).encode('utf-8')).hexdigest()
+    pfad = os.path.join(cache_verzeichnis, f'{schluessel}.pkl')
+    if os.path.exists(pfad) and time.time() - os.path.getmtime(pfad) < cache_max_alter_stunden * 3600:
+        return pd.read_pickle(pfad)
+    query_resultat = lade_daten(engine,query,params,conn=conn)
+    os.makedirs(cache_verzeichnis, exist_ok=True)
+    query_resultat.to_pickle(pfad)
     return query_resultat
 
+def verkleinere_dtypes(df):
+    # Schmale Dtypes: Zahlen-Spalten als Int16/Int32/Int64, wiederholte Strings als category
+    zahl_spalten = {'Jahrgang': 'Int16', 'Plz': 'Int32', 'Crefo': 'Int64'}
+    text_spalten = ('Name', 'Vorname', 'Name2', 'Strasse', 'Ort')
+    neue_spalten = {}
+    for spalte, dtype in zahl_spalten.items():
+        if spalte not in df.columns:
+            continue
+        werte = pd.to_numeric(df[spalte], errors='coerce')
+        grenzen = np.iinfo(dtype.lower())
+        # Nur umwandeln, wenn dabei kein Wert verloren geht (Text, Nachkommastellen, Ueberlauf)
+        verlustfrei = (werte.notna().sum() == df[spalte].notna().sum()
+                       and (werte.dropna() % 1 == 0).all()
+                       and werte.dropna().between(grenzen.min, grenzen.max).all())
+        if verlustfrei:
+            neue_spalten[spalte] = werte.astype(dtype)
+    for spalte in text_spalten:
+        if spalte in df.columns:
+            neue_spalten[spalte] = df[spalte].astype('category')
+    return df.assign(**neue_spalten)
+
 conn_string = conn_string_sql_alchemy(server, db, driver)
 engine = erzeuge_engine_von_conn_string_sql_alchemy(conn_string)
 print(conn_string)
 
 
+# Nur die Spalten, die der Dublettencheck verwendet; Filter und Limit als Bind-Parameter
 query = """
-SELECT TOP (1000) [Name]
+SELECT TOP (:n) [Name]
       ,[Vorname]
       ,[Name2]
       ,[Strasse]
@@ -48,11 +105,12 @@ SELECT TOP (1000) [Name]
       ,[Crefo]
       ,[Geburtstag]
       ,[Jahrgang]
-      ,[Erfasst]
-      ,[Quelle_95]
   FROM [CAG_Analyse].[dbo].[vAdresse_Quelle95]
-  Where Erfasst < dateadd(day,-7,getdate())
+  Where Erfasst < dateadd(day,-:tage,getdate())
 """
-df = lade_daten(engine,query)
+# Vorschau nur beim direkten Ausfuehren, nicht bei "from data import ..."
+if __name__ == '__main__':
+    df = verkleinere_dtypes(lade_daten_gecached(engine,query,{'n': vorschau_zeilen, 'tage': erfasst_vor_tagen}))
 # %%
-df.head()
\ No newline at end of file
+if __name__ == '__main__':
+    df.head()
\ No newline at end of file
@@ -17,21 +17,58 @@ Usage:
 
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Set, Tuple
 import logging
-from collections import defaultdict
+from collections import Counter, defaultdict
 import re
 from unidecode import unidecode
+from rapidfuzz import fuzz, process
 from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 import multiprocessing as mp
 import time
-from duplicate_checker_poc import DuplicateChecker, MatchResult
-from data import lade_daten, engine
+import heapq
+import io
+from duplicate_checker_poc import (DuplicateChecker, GermanNameNormalizer, MatchResult,
+                                   EFFECTIVE_YEAR_COLUMN, EXACT_MATCH_FIELDS)
+from shared_columns import SharedColumnStore, SharedColumnReader
+from data import lade_daten_chunks, engine
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Debug output for the Gloor / 'David Pablo' case in find_duplicates_in_block
+DEBUG_GLOOR = False
+
+# Parallel mode: blocks are packed into this many batches per worker process
+BATCHES_PER_WORKER = 4
+
+# Blocks larger than this only compare pairs sharing at least TRIGRAM_MIN_SHARED name trigrams
+TRIGRAM_MIN_BLOCK_SIZE = 100
+TRIGRAM_MIN_SHARED = 2
+
+# Blocks up to this size get their name similarities as cdist matrices (3 x k² float64)
+NAME_MATRIX_MAX_BLOCK_SIZE = 2000
+
+# Columns the matcher reads; blocks carry only these as plain arrays
+BLOCK_COLUMNS = ['Name', 'Vorname', 'Name2', 'Strasse', 'HausNummer', 'Plz', 'Ort',
+                 'Geburtstag', 'Jahrgang', EFFECTIVE_YEAR_COLUMN]
+
+# Address normalization patterns, compiled once
+_RE_HNUM_END = re.compile(r'\s+\d+[a-z]*$')
+_RE_HNUM_START = re.compile(r'^\d+[a-z]*\s+')
+_RE_WS = re.compile(r'\s+')
+_RE_NONALPHA = re.compile(r'[^a-z\s]')
+_RE_NONDIGIT = re.compile(r'\D')
+
+# Common German street suffix variations, longest first
+STREET_SUFFIX_MAPPINGS = tuple(sorted({
+    'str.': 'strasse', 'straße': 'strasse', 'str': 'strasse',
+    'weg': 'weg', 'allee': 'allee', 'platz': 'platz',
+    'gasse': 'gasse', 'ring': 'ring'
+}.items(), key=lambda mapping: len(mapping[0]), reverse=True))
+
 class GermanAddressNormalizer:
     """Handles German address normalization for blocking"""
     
@@ -41,32 +78,31 @@ class GermanAddressNormalizer:
         if pd.isna(street) or street is None:
             return ""
         
-        street = str(street).strip().lower()
-        
-        # Handle common German street suffix variations
-        suffix_mappings = {
-            'str.': 'strasse', 'straße': 'strasse', 'str': 'strasse',
-            'weg': 'weg', 'allee': 'allee', 'platz': 'platz',
-            'gasse': 'gasse', 'ring': 'ring'
-        }
+        return GermanAddressNormalizer._normalize_street_text(str(street))
+    
+    @staticmethod
+    def _normalize_street_text(street: str) -> str:
+        """normalize_street for a present value: one pass over the string, no Series round-trips"""
+        street = street.strip().lower()
         
         # Replace suffixes
-        for old_suffix, new_suffix in suffix_mappings.items():
+        for old_suffix, new_suffix in STREET_SUFFIX_MAPPINGS:
             if street.endswith(old_suffix):
                 street = street[:-len(old_suffix)] + new_suffix
                 break
         
         # Remove house numbers (common patterns)
-        street = re.sub(r'\s+\d+[a-z]*$', '', street)  # Number at end
-        street = re.sub(r'^\d+[a-z]*\s+', '', street)  # Number at start
+        street = _RE_HNUM_END.sub('', street)  # Number at end
+        street = _RE_HNUM_START.sub('', street)  # Number at start
         
-        # Handle umlauts
+        # Handle umlauts (unidecode only where non-ASCII characters are left)
         street = street.replace('ß', 'ss')
-        street = unidecode(street)
+        if not street.isascii():
+            street = unidecode(street)
         
         # Remove extra whitespace and special chars
-        street = re.sub(r'\s+', ' ', street)
-        street = re.sub(r'[^a-z\s]', '', street)
+        street = _RE_WS.sub(' ', street)
+        street = _RE_NONALPHA.sub('', street)
         
         return street.strip()
     
@@ -78,107 +114,298 @@ class GermanAddressNormalizer:
         
         plz = str(plz).strip()
         # Remove non-digit characters
-        plz = re.sub(r'\D', '', plz)
+        plz = _RE_NONDIGIT.sub('', plz)
         # Pad to 5 digits for German PLZ
         return plz.zfill(5)[:5]
+    
+    @staticmethod
+    def _unique_values(values: pd.Series) -> Tuple[np.ndarray, pd.Series]:
+        """Codes (-1 for missing) and distinct string values; addresses repeat heavily"""
+        codes = np.full(len(values), -1, dtype=np.intp)
+        present = values.notna().to_numpy()
+        codes[present], uniques = pd.factorize(values[present].astype(str))
+        return codes, pd.Series(uniques, dtype=object)
+    
+    @staticmethod
+    def _expand_unique(codes: np.ndarray, normalized: pd.Series, index: pd.Index) -> pd.Series:
+        """Map normalized distinct values back to rows, '' for missing"""
+        lookup = np.append(normalized.to_numpy(dtype=object), '')
+        return pd.Series(lookup[codes], index=index, dtype=object)
+    
+    @staticmethod
+    def normalize_street_series(streets: pd.Series) -> pd.Series:
+        """Vectorized normalize_street over a whole column (same result per value)"""
+        # Normalize each distinct street once, then map back; the per-string pass is
+        # cheaper than a chain of .str operations over the distinct values
+        codes, uniques = GermanAddressNormalizer._unique_values(streets)
+        normalized = uniques.map(GermanAddressNormalizer._normalize_street_text)
+        
+        return GermanAddressNormalizer._expand_unique(codes, normalized, streets.index)
+    
+    @staticmethod
+    def normalize_plz_series(plz: pd.Series) -> pd.Series:
+        """Vectorized normalize_plz over a whole column (same result per value)"""
+        codes, uniques = GermanAddressNormalizer._unique_values(plz)
+        normalized = (uniques.str.strip()
+                      .str.replace(_RE_NONDIGIT, '', regex=True)
+                      .str.zfill(5).str.slice(0, 5))
+        return GermanAddressNormalizer._expand_unique(codes, normalized, plz.index)
 
 class BlockingStrategy:
     """Implements multi-level blocking for performance optimization"""
     
-    def __init__(self):
+    def __init__(self, max_block_size: Optional[int] = None):
+        """
+        Args:
+            max_block_size: Address blocks larger than this are split again by Name/Vorname
+                            initial (None, the default, keeps every address block whole).
+                            Fuzzy pairs without a common initial are then no longer compared.
+        """
         self.address_normalizer = GermanAddressNormalizer()
+        self.max_block_size = max_block_size
     
     def create_blocking_keys(self, df: pd.DataFrame) -> pd.Series:
         """Create blocking keys for each record"""
-        blocking_keys = []
-        
-        for _, record in df.iterrows():
-            # Multi-level blocking: PLZ + Street
-            plz = self.address_normalizer.normalize_plz(record.get('Plz', ''))
-            street = self.address_normalizer.normalize_street(record.get('Strasse', ''))
-            
-            if plz and street:
-                blocking_key = f"{plz}_{street}"
-            elif plz:
-                # Fallback to PLZ-only if street missing
-                blocking_key = f"plz_only_{plz}"
-            elif street:
-                # Fallback to street-only if PLZ missing
-                blocking_key = f"street_only_{street}"
-            else:
-                # No address information - special category
-                blocking_key = "no_address"
-            
-            blocking_keys.append(blocking_key)
+        # Multi-level blocking: PLZ + Street, normalized column-wise
+        missing = pd.Series('', index=df.index, dtype=object)
+        plz = self.address_normalizer.normalize_plz_series(df.get('Plz', missing))
+        street = self.address_normalizer.normalize_street_series(df.get('Strasse', missing))
+        has_plz = (plz != '').to_numpy()
+        has_street = (street != '').to_numpy()
+        
+        blocking_keys = np.where(
+            has_plz & has_street, plz + '_' + street,
+            np.where(has_plz, 'plz_only_' + plz,              # Fallback to PLZ-only if street missing
+                     np.where(has_street, 'street_only_' + street,  # Fallback to street-only if PLZ missing
+                              'no_address')))                 # No address information - special category
         
         return pd.Series(blocking_keys, index=df.index)
     
-    def create_blocks(self, df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
-        """Group records into blocks for efficient comparison"""
+    @staticmethod
+    def block_columns(block_df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Matcher columns of a block as a dict of arrays (cheap to pickle for worker processes)"""
+        return {column: block_df[column].to_numpy() for column in BLOCK_COLUMNS if column in block_df.columns}
+    
+    @staticmethod
+    def split_block(group_df: pd.DataFrame) -> List[Tuple[str, pd.DataFrame]]:
+        """
+        Second level for dense streets: one overlapping sub-block per Name/Vorname initial.
+        A record joins the sub-blocks of both its initials, so Name/Vorname swaps still meet;
+        records with an empty Name or Vorname join every sub-block, since the exact rule
+        skips fields missing on one side. A pair can land in several sub-blocks (the
+        matches are deduplicated in find_duplicates).
+        """
+        def initials(column: str) -> np.ndarray:
+            if column not in group_df.columns:
+                return np.full(len(group_df), '', dtype=object)
+            return group_df[column].map(lambda name: GermanNameNormalizer.normalize_name(name)[:1]).to_numpy(dtype=object)
+        
+        name_initials = initials('Name')
+        vorname_initials = initials('Vorname')
+        open_rows = (name_initials == '') | (vorname_initials == '')
+        keys = sorted(set(name_initials[~open_rows]) | set(vorname_initials[~open_rows]))
+        if len(keys) < 2 or open_rows.all():
+            return [('', group_df)]
+        return [(initial, group_df[open_rows | (name_initials == initial) | (vorname_initials == initial)])
+                for initial in keys]
+    
+    def create_blocks(self, df: pd.DataFrame) -> Dict[str, Tuple[Dict[str, np.ndarray], List[int]]]:
+        """Group records into blocks of (column arrays, original indices) for efficient comparison"""
         logger.info("Creating address blocks for optimized comparison...")
         start_time = time.time()
         
         blocking_keys = self.create_blocking_keys(df)
-        df_with_keys = df.copy()
-        df_with_keys['blocking_key'] = blocking_keys
-        
-        # Group by blocking key, preserving original indices
-        blocks = defaultdict(list)
-        for idx, row in df_with_keys.iterrows():
-            blocks[row['blocking_key']].append((idx, row))
-        
-        # Convert to DataFrames with preserved indices
-        block_dfs = {}
-        for key, records in blocks.items():
-            if len(records) > 1:  # Only keep blocks with multiple records
-                # Extract original indices and data separately
-                original_indices = [record[0] for record in records]
-                block_data = [record[1] for record in records]
-                block_df = pd.DataFrame(block_data).reset_index(drop=True)
-                block_dfs[key] = (block_df, original_indices)
+        
+        # Group by blocking key (first-appearance order), preserving original indices
+        grouped = df.groupby(blocking_keys, sort=False)
+        sizes = grouped.size()
+        multi_sizes = sizes[sizes > 1]  # Only keep blocks with multiple records
+        
+        # Column arrays per block with preserved indices
+        blocks = {}
+        split_blocks = 0
+        for key in multi_sizes.index:
+            group_df = grouped.get_group(key)
+            if self.max_block_size and len(group_df) > self.max_block_size:
+                sub_blocks = self.split_block(group_df)
+                if len(sub_blocks) > 1:
+                    split_blocks += 1
+                for initial, sub_df in sub_blocks:
+                    if len(sub_df) > 1:
+                        blocks[f"{key}_{initial}"] = (self.block_columns(sub_df), sub_df.index.tolist())
+                continue
+            blocks[key] = (self.block_columns(group_df), group_df.index.tolist())
+        block_sizes = np.array([len(original_indices) for _, original_indices in blocks.values()], dtype=np.int64)
         
         # Log statistics
-        total_records = sum(len(block_df) for block_df in block_dfs.values())
-        avg_block_size = total_records / len(block_dfs) if block_dfs else 0
+        total_records = int(block_sizes.sum())
+        avg_block_size = total_records / len(blocks) if blocks else 0
         elapsed_time = time.time() - start_time
         
-        logger.info(f"Created {len(block_dfs)} blocks from {len(df)} records in {elapsed_time:.2f}s")
+        logger.info(f"Created {len(blocks)} blocks from {len(df)} records in {elapsed_time:.2f}s")
         logger.info(f"Average block size: {avg_block_size:.1f} records")
         logger.info(f"Total records in blocks: {total_records}")
+        if split_blocks:
+            logger.info(f"Split {split_blocks} blocks larger than {self.max_block_size} records by Name/Vorname initial")
         
         # Calculate potential comparison reduction
         original_comparisons = len(df) * (len(df) - 1) // 2
-        blocked_comparisons = sum(len(block) * (len(block) - 1) // 2 for block in block_dfs.values())
-        reduction_pct = (1 - blocked_comparisons / original_comparisons) * 100 if original_comparisons > 0 else 0
+        blocked_comparisons = int((block_sizes * (block_sizes - 1) // 2).sum())
+        reduction_ratio = 1 - blocked_comparisons / original_comparisons if original_comparisons > 0 else 0
         
-        logger.info(f"Comparison reduction: {original_comparisons:,} -> {blocked_comparisons:,} ({reduction_pct:.1f}% reduction)")
+        logger.info(f"Comparison reduction: {original_comparisons:,} -> {blocked_comparisons:,} "
+                    f"(RR={reduction_ratio:.3f}, {reduction_ratio * 100:.1f}% reduction)")
         
-        return block_dfs
+        return blocks
 
 class OptimizedDuplicateChecker:
     """Optimized duplicate checker with blocking and parallel processing"""
     
-    def __init__(self, fuzzy_threshold: float = 0.8):
+    def __init__(self, fuzzy_threshold: float = 0.8, max_block_size: Optional[int] = None):
         self.duplicate_checker = DuplicateChecker(fuzzy_threshold=fuzzy_threshold)
-        self.blocking_strategy = BlockingStrategy()
+        self.blocking_strategy = BlockingStrategy(max_block_size=max_block_size)
+        # Worker pool, started on first parallel run and kept until close()
+        self._executor = None
+    
+    def __getstate__(self):
+        # Workers get the checker via the pool initializer; the pool itself stays in the parent
+        state = self.__dict__.copy()
+        state['_executor'] = None
+        return state
+    
+    def __enter__(self) -> 'OptimizedDuplicateChecker':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Process pool shared by all find_duplicates calls (workers start and import once)"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=mp.cpu_count(),
+                                                 initializer=_init_block_worker, initargs=(self,))
+        return self._executor
+    
+    def close(self):
+        """Shut down the worker pool"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        
+    def exact_key_codes(self, records: List[Dict]) -> List[int]:
+        """
+        Hash-join key per record: code of (stripped exact-match fields, effective year) for
+        records where all exact-match fields are set, -1 otherwise (fields would be skipped)
+        """
+        codes = {}
+        keys = []
+        for record in records:
+            values = [record.get(field) for field in EXACT_MATCH_FIELDS]
+            if any(pd.isna(value) for value in values):
+                keys.append(-1)
+                continue
+            key = (tuple(str(value).strip() for value in values),
+                   self.duplicate_checker.business_rules.record_effective_year(record))
+            keys.append(codes.setdefault(key, len(codes)))
+        return keys
+    
+    @staticmethod
+    def name_similarity_matrices(records: List[Dict]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Struct-of-arrays name comparison for a block: normalized Vorname/Name arrays and
+        rapidfuzz cdist matrices with the FuzzyMatcher.name_similarity scorer (QRatio / 100).
+        Returns (Vorname x Vorname, Name x Name, Vorname x Name); cross[j, i] is Name_i x Vorname_j.
+        """
+        vornamen = [GermanNameNormalizer.normalize_name(record.get('Vorname', '')) for record in records]
+        namen = [GermanNameNormalizer.normalize_name(record.get('Name', '')) for record in records]
+        
+        def similarities(queries: List[str], choices: List[str]) -> np.ndarray:
+            # QRatio scores empty strings as 0, like name_similarity
+            return process.cdist(queries, choices, scorer=fuzz.QRatio, dtype=np.float64) / 100.0
         
-    def find_duplicates_in_block(self, block_df: pd.DataFrame, confidence_threshold: float, 
+        return similarities(vornamen, vornamen), similarities(namen, namen), similarities(vornamen, namen)
+    
+    @staticmethod
+    def fuzzy_pair_mask(name_matrices: Tuple[np.ndarray, np.ndarray, np.ndarray], fuzzy_threshold: float) -> np.ndarray:
+        """Upper-triangle mask of pairs whose best name score (normal or swapped) reaches the fuzzy threshold"""
+        vorname_sim, name_sim, cross_sim = name_matrices
+        normal_score = (vorname_sim + name_sim) / 2
+        swapped_score = (cross_sim + cross_sim.T) / 2
+        return np.triu(np.maximum(normal_score, swapped_score) >= fuzzy_threshold, k=1)
+    
+    @staticmethod
+    def trigram_candidates(records: List[Dict]) -> List[Set[int]]:
+        """
+        Fuzzy candidate generator over an inverted 3-gram index of normalized 'Vorname Name':
+        per record the later records sharing at least TRIGRAM_MIN_SHARED trigrams.
+        Records with too few trigrams (very short or missing names) are compared with all.
+        """
+        texts = [f"{GermanNameNormalizer.normalize_name(record.get('Vorname'))} "
+                 f"{GermanNameNormalizer.normalize_name(record.get('Name'))}" for record in records]
+        trigrams = [{text[k:k + 3] for k in range(len(text) - 2)} for text in texts]
+        
+        postings = defaultdict(list)
+        for idx, grams in enumerate(trigrams):
+            for gram in grams:
+                postings[gram].append(idx)
+        short = [idx for idx, grams in enumerate(trigrams) if len(grams) < TRIGRAM_MIN_SHARED]
+        
+        candidates = []
+        for i, grams in enumerate(trigrams):
+            if len(grams) < TRIGRAM_MIN_SHARED:
+                candidates.append(set(range(i + 1, len(records))))
+                continue
+            shared = Counter(j for gram in grams for j in postings[gram] if j > i)
+            selected = {j for j, count in shared.items() if count >= TRIGRAM_MIN_SHARED}
+            selected.update(j for j in short if j > i)
+            candidates.append(selected)
+        
+        total_pairs = len(records) * (len(records) - 1) // 2
+        candidate_pairs = sum(len(block_candidates) for block_candidates in candidates)
+        logger.debug(f"Trigram filter: {total_pairs:,} -> {candidate_pairs:,} pairs "
+                     f"(RR={1 - candidate_pairs / total_pairs:.3f})")
+        return candidates
+    
+    def find_duplicates_in_block(self, block_columns: Dict[str, np.ndarray], confidence_threshold: float, 
                                 original_indices: List[int]) -> List[MatchResult]:
         """Find duplicates within a single block"""
-        if len(block_df) < 2:
+        if len(original_indices) < 2:
             return []
         
         matches = []
+        # Plain dicts once per block instead of a Series per iloc access; the
+        # DuplicateChecker rules only need .get / [] access on a record
+        columns = list(block_columns)
+        records = ([dict(zip(columns, values)) for values in zip(*block_columns.values())]
+                   if columns else [{} for _ in original_indices])
+        # Gloor debug flags once per record, not per pair
+        gloor_case = ([('Gloor' in str(record.get('Name', '')) and 'David Pablo' in str(record.get('Vorname', '')))
+                       for record in records] if DEBUG_GLOOR else [False] * len(records))
+        exact_keys = self.exact_key_codes(records)
+        # Cheap per-record discriminators: both the exact and the fuzzy check start with the
+        # Zweitname and date rules, so pairs failing them never reach the name comparison
+        business_rules = self.duplicate_checker.business_rules
+        effective_years = np.array([business_rules.record_effective_year(record) for record in records], dtype=np.int64)
+        zweitnamen = [GermanNameNormalizer.normalize_zweitname(record.get('Name2')) for record in records]
+        # Fuzzy candidates: pairs whose cdist name score reaches the fuzzy threshold, or for blocks too
+        # large for the matrices a trigram index (exact checks still see every pair - they may match on
+        # address with complementary missing names)
+        name_matrices = self.name_similarity_matrices(records) if len(records) <= NAME_MATRIX_MAX_BLOCK_SIZE else None
+        fuzzy_pairs = (self.fuzzy_pair_mask(name_matrices, self.duplicate_checker.fuzzy_threshold)
+                       if name_matrices is not None else None)
+        fuzzy_candidates = (self.trigram_candidates(records)
+                            if name_matrices is None and len(records) > TRIGRAM_MIN_BLOCK_SIZE else None)
         
         # Use the original duplicate checker logic but only within the block
-        for i in range(len(block_df)):
-            for j in range(i + 1, len(block_df)):
-                record_i = block_df.iloc[i]
-                record_j = block_df.iloc[j]
+        for i in range(len(records)):
+            record_i = records[i]
+            for j in business_rules.date_rule_candidates(effective_years, i).tolist():
+                if zweitnamen[i] and zweitnamen[j] and zweitnamen[i] != zweitnamen[j]:
+                    continue
+                record_j = records[j]
                 
                 # DEBUG: Print details for problematic case
-                is_gloor_case = (('Gloor' in str(record_i.get('Name', '')) and 'David Pablo' in str(record_i.get('Vorname', ''))) or
-                                 ('Gloor' in str(record_j.get('Name', '')) and 'David Pablo' in str(record_j.get('Vorname', ''))))
+                is_gloor_case = gloor_case[i] or gloor_case[j]
                 
                 if is_gloor_case:
                     print(f"DEBUG: Checking potential Gloor case:")
@@ -187,8 +414,11 @@ class OptimizedDuplicateChecker:
                     print(f"  Record {j}: {record_j.get('Vorname')} {record_j.get('Name')}")
                     print(f"    Geburtstag: '{record_j.get('Geburtstag')}', Jahrgang: '{record_j.get('Jahrgang')}'")
                 
-                # Check exact match first
-                exact_match = self.duplicate_checker.check_exact_match(record_i, record_j)
+                # Check exact match first (complete records with different exact keys cannot match exactly)
+                if exact_keys[i] >= 0 and exact_keys[j] >= 0 and exact_keys[i] != exact_keys[j]:
+                    exact_match = None
+                else:
+                    exact_match = self.duplicate_checker.check_exact_match(record_i, record_j)
                 if exact_match and exact_match.confidence_score >= confidence_threshold:
                     # DEBUG: Print if exact match found for Gloor case
                     if is_gloor_case:
@@ -201,8 +431,18 @@ class OptimizedDuplicateChecker:
                     matches.append(exact_match)
                     continue  # Skip fuzzy if exact match found
                 
+                if fuzzy_pairs is not None and not fuzzy_pairs[i, j]:
+                    continue
+                if fuzzy_candidates is not None and j not in fuzzy_candidates[i]:
+                    continue
+                
                 # Check fuzzy match
-                fuzzy_match = self.duplicate_checker.check_fuzzy_match(record_i, record_j)
+                name_results = None
+                if name_matrices is not None:
+                    vorname_sim, name_sim, cross_sim = name_matrices
+                    name_results = self.duplicate_checker.fuzzy_matcher.combine_name_similarities(
+                        vorname_sim[i, j], name_sim[i, j], cross_sim[i, j], cross_sim[j, i])
+                fuzzy_match = self.duplicate_checker.check_fuzzy_match(record_i, record_j, name_results)
                 if fuzzy_match and fuzzy_match.confidence_score >= confidence_threshold:
                     fuzzy_match.record_a_idx = original_indices[i]
                     fuzzy_match.record_b_idx = original_indices[j]
@@ -210,6 +450,22 @@ class OptimizedDuplicateChecker:
         
         return matches
     
+    @staticmethod
+    def pack_block_batches(blocks: Dict[str, Tuple[Dict[str, np.ndarray], List[int]]],
+                           num_batches: int) -> List[List[Tuple[str, Dict[str, np.ndarray], List[int]]]]:
+        """
+        Greedy packing of blocks into batches of roughly equal work (k² comparisons):
+        largest blocks first, each into the currently lightest batch
+        """
+        batches = [[] for _ in range(min(num_batches, len(blocks)))]
+        loads = [(0, batch_idx) for batch_idx in range(len(batches))]
+        by_size = sorted(blocks.items(), key=lambda item: len(item[1][1]), reverse=True)
+        for block_key, (block_columns, original_indices) in by_size:
+            load, batch_idx = heapq.heappop(loads)
+            batches[batch_idx].append((block_key, block_columns, original_indices))
+            heapq.heappush(loads, (load + len(original_indices) ** 2, batch_idx))
+        return batches
+    
     def find_duplicates(self, df: pd.DataFrame, confidence_threshold: float = 70.0, 
                        use_parallel: bool = True) -> List[MatchResult]:
         """
@@ -221,11 +477,14 @@ class OptimizedDuplicateChecker:
             use_parallel: Whether to use parallel processing
             
         Returns:
-            List of match results
+            List of match results, sorted by confidence (highest first)
         """
         logger.info(f"Starting optimized duplicate analysis for {len(df)} records")
         start_time = time.time()
         
+        # Effective years once per DataFrame instead of parsing dates per pair
+        df = self.duplicate_checker.add_effective_years(df)
+        
         # Create blocks
         blocks = self.blocking_strategy.create_blocks(df)
         
@@ -234,72 +493,148 @@ class OptimizedDuplicateChecker:
             return []
         
         all_matches = []
+        sorted_batches = []  # Parallel mode: per-batch results, already sorted by the workers
         
         if use_parallel and len(blocks) > 1:
-            # Parallel processing of blocks
-            logger.info(f"Processing {len(blocks)} blocks in parallel...")
+            # Parallel processing of blocks, packed into a few batches to amortize pickling/IPC
             num_workers = min(mp.cpu_count(), len(blocks))
+            batches = self.pack_block_batches(blocks, num_workers * BATCHES_PER_WORKER)
+            logger.info(f"Processing {len(blocks)} blocks in parallel ({len(batches)} batches)...")
             
-            with ProcessPoolExecutor(max_workers=num_workers) as executor:
-                # Submit tasks for each block
-                future_to_block = {}
-                
-                for block_key, block_tuple in blocks.items():
-                    block_df, original_indices = block_tuple
-                    
-                    future = executor.submit(
-                        self.find_duplicates_in_block, 
-                        block_df, 
-                        confidence_threshold,
-                        original_indices
-                    )
-                    future_to_block[future] = block_key
+            # Columns go to the workers once via shared memory; tasks only carry row positions.
+            # Row positions need a unique index, otherwise the block arrays are pickled per batch.
+            store = SharedColumnStore.create(df, BLOCK_COLUMNS) if df.index.is_unique else None
+            if store is None:
+                logger.warning("DataFrame index is not unique - sending block arrays to workers")
+            
+            try:
+                executor = self._get_executor()
+                # Submit one task per batch
+                future_to_batch = {}
+                for batch in batches:
+                    if store is None:
+                        future = executor.submit(_process_block_batch, batch, confidence_threshold)
+                    else:
+                        positions_batch = [(block_key, df.index.get_indexer(original_indices), original_indices)
+                                           for block_key, _, original_indices in batch]
+                        future = executor.submit(_process_shared_block_batch, store.specs, positions_batch,
+                                                 confidence_threshold)
+                    future_to_batch[future] = batch
                 
                 # Collect results
-                for future in as_completed(future_to_block):
-                    block_key = future_to_block[future]
+                for future in as_completed(future_to_batch):
+                    batch = future_to_batch[future]
                     try:
-                        block_matches = future.result()
-                        all_matches.extend(block_matches)
-                        logger.info(f"Block {block_key}: {len(block_matches)} matches")
+                        batch_matches = future.result()
+                        sorted_batches.append(batch_matches)
+                        logger.info(f"Batch of {len(batch)} blocks: {len(batch_matches)} matches")
                     except Exception as e:
-                        logger.error(f"Error processing block {block_key}: {e}")
+                        logger.error(f"Error processing batch with blocks {[block[0] for block in batch]}: {e}")
+                        if isinstance(e, BrokenProcessPool):
+                            # A dead worker breaks the pool; the next run starts a fresh one
+                            self._executor = None
+            finally:
+                if store is not None:
+                    store.release()
         else:
             # Sequential processing
             logger.info(f"Processing {len(blocks)} blocks sequentially...")
             for block_key, block_tuple in blocks.items():
-                block_df, original_indices = block_tuple
-                block_matches = self.find_duplicates_in_block(block_df, confidence_threshold, original_indices)
+                block_columns, original_indices = block_tuple
+                block_matches = self.find_duplicates_in_block(block_columns, confidence_threshold, original_indices)
                 all_matches.extend(block_matches)
                 logger.info(f"Block {block_key}: {len(block_matches)} matches")
         
-        # Sort by confidence
-        all_matches.sort(key=lambda x: x.confidence_score, reverse=True)
+        # Sort by confidence (parallel batches come pre-sorted and are only merged)
+        if sorted_batches:
+            all_matches = list(heapq.merge(*sorted_batches, key=match_confidence, reverse=True))
+        else:
+            all_matches.sort(key=match_confidence, reverse=True)
+        if self.blocking_strategy.max_block_size:
+            # Split blocks overlap; a pair found in several sub-blocks is reported once
+            unique_pairs = {}
+            for match in all_matches:
+                unique_pairs.setdefault((match.record_a_idx, match.record_b_idx), match)
+            all_matches = list(unique_pairs.values())
         
         elapsed_time = time.time() - start_time
         logger.info(f"Found {len(all_matches)} potential duplicates in {elapsed_time:.2f}s")
         
         return all_matches
 
+def match_confidence(match: MatchResult) -> float:
+    """Sort key for match lists (module level so worker processes can use it)"""
+    return match.confidence_score
+
+# Per-process state of the pool workers (set by _init_block_worker / _shared_reader)
+_worker_state = {}
+
+def _init_block_worker(checker: OptimizedDuplicateChecker):
+    """Pool initializer: keep the checker once per worker"""
+    _worker_state['checker'] = checker
+
+def _shared_reader(specs: Dict[str, Tuple]) -> SharedColumnReader:
+    """Reader for the store of the current run, attached once per worker and run"""
+    if _worker_state.get('specs') != specs:
+        if 'reader' in _worker_state:
+            _worker_state['reader'].close()
+        _worker_state['reader'] = SharedColumnReader(specs)
+        _worker_state['specs'] = specs
+    return _worker_state['reader']
+
+def _process_shared_block_batch(specs: Dict[str, Tuple], batch: List[Tuple[str, np.ndarray, List[int]]],
+                                confidence_threshold: float) -> List[MatchResult]:
+    """Worker entry point for shared-memory mode: blocks given as row positions"""
+    checker = _worker_state['checker']
+    reader = _shared_reader(specs)
+    matches = []
+    for _, positions, original_indices in batch:
+        matches.extend(checker.find_duplicates_in_block(reader.block_columns(positions),
+                                                        confidence_threshold, original_indices))
+    matches.sort(key=match_confidence, reverse=True)
+    return matches
+
+def _process_block_batch(batch: List[Tuple[str, Dict[str, np.ndarray], List[int]]],
+                         confidence_threshold: float) -> List[MatchResult]:
+    """Worker entry point (module level so it pickles): all blocks of one batch"""
+    checker = _worker_state['checker']
+    matches = []
+    for _, block_columns, original_indices in batch:
+        matches.extend(checker.find_duplicates_in_block(block_columns, confidence_threshold, original_indices))
+    matches.sort(key=match_confidence, reverse=True)
+    return matches
+
 class DuplicateCheckerIntegration:
     """Integration layer between duplicate checker and data.py"""
     
     def __init__(self, fuzzy_threshold: float = 0.8, use_parallel: bool = True):
         self.optimized_checker = OptimizedDuplicateChecker(fuzzy_threshold=fuzzy_threshold)
         self.use_parallel = use_parallel
+    
+    def __enter__(self) -> 'DuplicateCheckerIntegration':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def close(self):
+        """Release the worker pool of the optimized checker"""
+        self.optimized_checker.close()
         
-    def load_data_from_sql(self, limit: int = 1000) -> pd.DataFrame:
+    def load_data_from_sql(self, limit: int = 1000, chunksize: int = 50000) -> pd.DataFrame:
         """
         Load data from SQL Server using existing data.py functions
         
         Args:
             limit: Maximum number of records to load (for testing)
+            chunksize: Rows per streamed chunk (server-side cursor)
             
         Returns:
             DataFrame with address data
         """
-        query = f"""
-        SELECT [Name]
+        # Limit as bind parameter in TOP, the server only returns the requested rows
+        query = """
+        SELECT TOP (:limit) [Name]
               ,[Vorname]
               ,[Name2]
               ,[Strasse]
@@ -318,7 +653,13 @@ class DuplicateCheckerIntegration:
         
         try:
             logger.info(f"Loading {limit} records from SQL Server...")
-            df = lade_daten(engine, query)
+            chunks = []
+            loaded = 0
+            for chunk in lade_daten_chunks(engine, query, {'limit': int(limit)}, chunksize=chunksize):
+                chunks.append(chunk)
+                loaded += len(chunk)
+                logger.info(f"  ... {loaded:,} records loaded")
+            df = chunks[0] if len(chunks) == 1 else pd.concat(chunks, ignore_index=True)
             logger.info(f"Successfully loaded {len(df)} records")
             return df
         except Exception as e:
@@ -354,24 +695,27 @@ class DuplicateCheckerIntegration:
     def _clean_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """Basic data cleaning before duplicate detection"""
         
-        # Make a copy to avoid modifying original
-        df_clean = df.copy()
+        # Cleaned columns are collected and attached with assign: the original stays untouched
+        # and the untouched columns are not copied
+        cleaned_columns = {}
         
         # Convert all string columns to string type and strip whitespace
         string_columns = ['Name', 'Vorname', 'Name2', 'Strasse', 'HausNummer', 'Plz', 'Ort']
         
         for col in string_columns:
-            if col in df_clean.columns:
-                df_clean[col] = df_clean[col].astype(str).str.strip()
-                # Replace 'nan' strings with actual NaN
-                df_clean[col] = df_clean[col].replace('nan', pd.NA)
+            if col in df.columns:
+                # Pandas string dtype (missing values stay <NA>)
+                stripped = df[col].astype('string').str.strip()
+                # Placeholder texts and empty strings count as missing
+                cleaned_columns[col] = stripped.mask(stripped.isin(['nan', 'None', '']), pd.NA)
         
         # IMPORTANT: Do NOT clean Geburtstag and Jahrgang - they need original values for date rules
         # Only convert None/NaN to empty string for consistency
-        if 'Geburtstag' in df_clean.columns:
-            df_clean['Geburtstag'] = df_clean['Geburtstag'].fillna('')
-        if 'Jahrgang' in df_clean.columns:
-            df_clean['Jahrgang'] = df_clean['Jahrgang'].fillna('')
+        for col in ('Geburtstag', 'Jahrgang'):
+            if col in df.columns:
+                cleaned_columns[col] = df[col].fillna('')
+        
+        df_clean = df.assign(**cleaned_columns)
         
         logger.info(f"Data cleaning completed. {len(df_clean)} records ready for analysis.")
         return df_clean
@@ -418,7 +762,7 @@ class DuplicateCheckerIntegration:
         }
         
         # Top matches (highest confidence)
-        top_matches = sorted(matches, key=lambda x: x.confidence_score, reverse=True)[:10]
+        top_matches = heapq.nlargest(10, matches, key=match_confidence)
         
         return {
             'total_matches': len(matches),
@@ -441,54 +785,51 @@ class DuplicateCheckerIntegration:
             df: Original DataFrame
             max_results: Maximum number of results to display
         """
-        print("\n" + "="*100)
-        print("DETAILED DUPLICATE ANALYSIS RESULTS")
-        print("="*100)
+        # Collect the output and write it once instead of many small print calls
+        out = io.StringIO()
+        out.write("\n" + "="*100 + "\n")
+        out.write("DETAILED DUPLICATE ANALYSIS RESULTS\n")
+        out.write("="*100 + "\n")
         
         if not matches:
-            print("No duplicates found.")
+            out.write("No duplicates found.\n")
+            print(out.getvalue(), end='')
             return
         
-        # Sort by confidence (highest first)
-        sorted_matches = sorted(matches, key=lambda x: x.confidence_score, reverse=True)
+        # Top matches by confidence (highest first), without sorting the whole list
+        top_matches = heapq.nlargest(max_results, matches, key=match_confidence)
         
-        for i, match in enumerate(sorted_matches[:max_results], 1):
-            record_a = df.iloc[match.record_a_idx]
-            record_b = df.iloc[match.record_b_idx]
-            
-            print(f"\n{'-'*80}")
-            print(f"Match {i}: {match.match_type.upper().replace('_', ' ')}")
-            print(f"Confidence: {match.confidence_score:.1f}%")
-            print(f"{'-'*80}")
-            
-            # Record A details
-            print(f"\nRECORD A (Index: {match.record_a_idx}):")
-            print(f"  Name: {record_a.get('Vorname', 'N/A')} {record_a.get('Name', 'N/A')}")
-            print(f"  Zweitname: {record_a.get('Name2', 'N/A')}")
-            print(f"  Address: {record_a.get('Strasse', 'N/A')} {record_a.get('HausNummer', 'N/A')}")
-            print(f"  Location: {record_a.get('Plz', 'N/A')} {record_a.get('Ort', 'N/A')}")
-            print(f"  Birth: {record_a.get('Geburtstag', 'N/A')} (Jahrgang: {record_a.get('Jahrgang', 'N/A')})")
-            print(f"  Crefo: {record_a.get('Crefo', 'N/A')}")
-            print(f"  Source: {record_a.get('Quelle_95', 'N/A')}")
+        # All displayed records in one positional lookup per side
+        records_a = df.iloc[[match.record_a_idx for match in top_matches]].to_dict('records')
+        records_b = df.iloc[[match.record_b_idx for match in top_matches]].to_dict('records')
+        
+        for i, (match, record_a, record_b) in enumerate(zip(top_matches, records_a, records_b), 1):
+            out.write(f"\n{'-'*80}\n")
+            out.write(f"Match {i}: {match.match_type.upper().replace('_', ' ')}\n")
+            out.write(f"Confidence: {match.confidence_score:.1f}%\n")
+            out.write(f"{'-'*80}\n")
             
-            # Record B details
-            print(f"\nRECORD B (Index: {match.record_b_idx}):")
-            print(f"  Name: {record_b.get('Vorname', 'N/A')} {record_b.get('Name', 'N/A')}")
-            print(f"  Zweitname: {record_b.get('Name2', 'N/A')}")
-            print(f"  Address: {record_b.get('Strasse', 'N/A')} {record_b.get('HausNummer', 'N/A')}")
-            print(f"  Location: {record_b.get('Plz', 'N/A')} {record_b.get('Ort', 'N/A')}")
-            print(f"  Birth: {record_b.get('Geburtstag', 'N/A')} (Jahrgang: {record_b.get('Jahrgang', 'N/A')})")
-            print(f"  Crefo: {record_b.get('Crefo', 'N/A')}")
-            print(f"  Source: {record_b.get('Quelle_95', 'N/A')}")
+            for label, record_idx, record in (('A', match.record_a_idx, record_a), ('B', match.record_b_idx, record_b)):
+                # Record details
+                out.write(f"\nRECORD {label} (Index: {record_idx}):\n")
+                out.write(f"  Name: {record.get('Vorname', 'N/A')} {record.get('Name', 'N/A')}\n")
+                out.write(f"  Zweitname: {record.get('Name2', 'N/A')}\n")
+                out.write(f"  Address: {record.get('Strasse', 'N/A')} {record.get('HausNummer', 'N/A')}\n")
+                out.write(f"  Location: {record.get('Plz', 'N/A')} {record.get('Ort', 'N/A')}\n")
+                out.write(f"  Birth: {record.get('Geburtstag', 'N/A')} (Jahrgang: {record.get('Jahrgang', 'N/A')})\n")
+                out.write(f"  Crefo: {record.get('Crefo', 'N/A')}\n")
+                out.write(f"  Source: {record.get('Quelle_95', 'N/A')}\n")
             
             # Match details for fuzzy matches
             if match.match_type.startswith('fuzzy'):
                 name_results = match.details.get('name_results', {})
-                print(f"\nMATCH DETAILS:")
-                print(f"  Name similarity (normal): {name_results.get('normal_score', 0):.2f}")
-                print(f"  Name similarity (swapped): {name_results.get('swapped_score', 0):.2f}")
-                print(f"  Address match ratio: {match.details.get('address_ratio', 0):.2f}")
-                print(f"  Names swapped: {'Yes' if name_results.get('is_swapped', False) else 'No'}")
+                out.write(f"\nMATCH DETAILS:\n")
+                out.write(f"  Name similarity (normal): {name_results.get('normal_score', 0):.2f}\n")
+                out.write(f"  Name similarity (swapped): {name_results.get('swapped_score', 0):.2f}\n")
+                out.write(f"  Address match ratio: {match.details.get('address_ratio', 0):.2f}\n")
+                out.write(f"  Names swapped: {'Yes' if name_results.get('is_swapped', False) else 'No'}\n")
+        
+        print(out.getvalue(), end='')
     
     def export_results_to_csv(self, matches: List[MatchResult], df: pd.DataFrame, 
                               filename: str = "duplicate_analysis_results.csv"):
@@ -504,78 +845,63 @@ class DuplicateCheckerIntegration:
             logger.warning("No matches to export")
             return
         
-        # Prepare data for export
-        export_data = []
-        
-        for match in matches:
-            record_a = df.iloc[match.record_a_idx]
-            record_b = df.iloc[match.record_b_idx]
-            
-            # Get Crefo numbers for unique match identification
-            crefo_a = str(record_a.get('Crefo', '')).strip()
-            crefo_b = str(record_b.get('Crefo', '')).strip()
-            match_id = f"{crefo_a}_{crefo_b}" if crefo_a and crefo_b else f"{match.record_a_idx}_{match.record_b_idx}"
-            
-            # Create two separate rows for each match (A and B records below each other)
-            row_a = {
-                'crefo1_crefo2': match_id,
-                'record_position': 'A',
-                'confidence_score': match.confidence_score,
-                'match_type': match.match_type,
-                'record_index': match.record_a_idx,
-                'name': f"{record_a.get('Vorname', '')} {record_a.get('Name', '')}".strip(),
-                'vorname': record_a.get('Vorname', ''),
-                'name_field': record_a.get('Name', ''),
-                'name2': record_a.get('Name2', ''),
-                'strasse': record_a.get('Strasse', ''),
-                'hausnummer': record_a.get('HausNummer', ''),
-                'plz': record_a.get('Plz', ''),
-                'ort': record_a.get('Ort', ''),
-                'crefo': record_a.get('Crefo', ''),
-                'geburtstag': record_a.get('Geburtstag', ''),
-                'jahrgang': record_a.get('Jahrgang', ''),
-                'erfasst': record_a.get('Erfasst', ''),
-                'quelle_95': record_a.get('Quelle_95', ''),
-            }
-            
-            row_b = {
-                'crefo1_crefo2': match_id,
-                'record_position': 'B',
-                'confidence_score': match.confidence_score,
-                'match_type': match.match_type,
-                'record_index': match.record_b_idx,
-                'name': f"{record_b.get('Vorname', '')} {record_b.get('Name', '')}".strip(),
-                'vorname': record_b.get('Vorname', ''),
-                'name_field': record_b.get('Name', ''),
-                'name2': record_b.get('Name2', ''),
-                'strasse': record_b.get('Strasse', ''),
-                'hausnummer': record_b.get('HausNummer', ''),
-                'plz': record_b.get('Plz', ''),
-                'ort': record_b.get('Ort', ''),
-                'crefo': record_b.get('Crefo', ''),
-                'geburtstag': record_b.get('Geburtstag', ''),
-                'jahrgang': record_b.get('Jahrgang', ''),
-                'erfasst': record_b.get('Erfasst', ''),
-                'quelle_95': record_b.get('Quelle_95', ''),
+        # Prepare data for export: all referenced records in one positional lookup per side
+        records_a = df.iloc[[match.record_a_idx for match in matches]].reset_index(drop=True)
+        records_b = df.iloc[[match.record_b_idx for match in matches]].reset_index(drop=True)
+        
+        def column(records: pd.DataFrame, name: str) -> pd.Series:
+            if name in records.columns:
+                return records[name].astype(object)
+            return pd.Series('', index=records.index, dtype=object)
+        
+        # Get Crefo numbers for unique match identification
+        crefo_a = column(records_a, 'Crefo').map(lambda value: str(value).strip())
+        crefo_b = column(records_b, 'Crefo').map(lambda value: str(value).strip())
+        fallback_ids = [f"{match.record_a_idx}_{match.record_b_idx}" for match in matches]
+        match_ids = np.where((crefo_a != '') & (crefo_b != ''), crefo_a + '_' + crefo_b, fallback_ids)
+        
+        # Fuzzy match details if available (only for fuzzy matches)
+        fuzzy_columns = {}
+        if any(match.match_type.startswith('fuzzy') for match in matches):
+            fuzzy_details = [(match.details.get('name_results', {}), match.details.get('address_ratio', 0))
+                             if match.match_type.startswith('fuzzy') else None for match in matches]
+            fuzzy_columns = {
+                'name_similarity_normal': [d[0].get('normal_score', 0) if d else None for d in fuzzy_details],
+                'name_similarity_swapped': [d[0].get('swapped_score', 0) if d else None for d in fuzzy_details],
+                'is_swapped': [d[0].get('is_swapped', False) if d else None for d in fuzzy_details],
+                'address_match_ratio': [d[1] if d else None for d in fuzzy_details],
             }
-            
-            # Add fuzzy match details if available (only to first record to avoid duplication)
-            if match.match_type.startswith('fuzzy'):
-                name_results = match.details.get('name_results', {})
-                fuzzy_info = {
-                    'name_similarity_normal': name_results.get('normal_score', 0),
-                    'name_similarity_swapped': name_results.get('swapped_score', 0),
-                    'is_swapped': name_results.get('is_swapped', False),
-                    'address_match_ratio': match.details.get('address_ratio', 0)
-                }
-                row_a.update(fuzzy_info)
-                row_b.update(fuzzy_info)
-            
-            export_data.append(row_a)
-            export_data.append(row_b)
         
-        # Create DataFrame and export
-        export_df = pd.DataFrame(export_data)
+        def export_rows(records: pd.DataFrame, position: str, record_indices: List[int]) -> pd.DataFrame:
+            vorname = column(records, 'Vorname')
+            name = column(records, 'Name')
+            return pd.DataFrame({
+                'crefo1_crefo2': match_ids,
+                'record_position': position,
+                'confidence_score': [match.confidence_score for match in matches],
+                'match_type': [match.match_type for match in matches],
+                'record_index': record_indices,
+                'name': (vorname.map(str) + ' ' + name.map(str)).str.strip(),
+                'vorname': vorname,
+                'name_field': name,
+                'name2': column(records, 'Name2'),
+                'strasse': column(records, 'Strasse'),
+                'hausnummer': column(records, 'HausNummer'),
+                'plz': column(records, 'Plz'),
+                'ort': column(records, 'Ort'),
+                'crefo': column(records, 'Crefo'),
+                'geburtstag': column(records, 'Geburtstag'),
+                'jahrgang': column(records, 'Jahrgang'),
+                'erfasst': column(records, 'Erfasst'),
+                'quelle_95': column(records, 'Quelle_95'),
+                **fuzzy_columns,
+            })
+        
+        # Two rows per match (A and B records below each other)
+        rows_a = export_rows(records_a, 'A', [match.record_a_idx for match in matches])
+        rows_b = export_rows(records_b, 'B', [match.record_b_idx for match in matches])
+        interleaved = np.column_stack([np.arange(len(matches)), np.arange(len(matches)) + len(matches)]).ravel()
+        export_df = pd.concat([rows_a, rows_b], ignore_index=True).iloc[interleaved].reset_index(drop=True)
         export_df.to_csv(filename, index=False, encoding='utf-8-sig')
         logger.info(f"Results exported to {filename} with {len(export_df)} matches")
 
@@ -638,6 +964,8 @@ def main():
         logger.error(f"Error during analysis: {e}")
         print(f"Analysis failed: {e}")
         return 1
+    finally:
+        integration.close()
     
     return 0
 
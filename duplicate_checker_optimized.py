@@ -20,19 +20,40 @@ import logging
 from collections import defaultdict
 import re
 from unidecode import unidecode
-from concurrent.futures import ProcessPoolExecutor, as_completed
 import multiprocessing as mp
 import time
 from dataclasses import dataclass, asdict
 import hashlib
-from rapidfuzz import fuzz
+from rapidfuzz import fuzz, process
 import pickle
+from functools import lru_cache
 import cologne_phonetics
+from shared_columns import SharedColumnStore, SharedColumnReader
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Address fields compared for the address ratio
+ADDRESS_FIELDS = ['Strasse', 'HausNummer', 'Plz', 'Ort']
+
+# Columns process_block_worker reads (besides the original 'index'); blocks travel to the
+# workers as these arrays only
+BLOCK_COLUMNS = ['Vorname', 'Name', 'Name2', 'Strasse', 'HausNummer', 'Plz', 'Ort',
+                 'Geburtstag', 'Jahrgang', 'vorname_phon', 'name_phon', '_eff_year']
+
+# Borderline name scores from here up to the fuzzy threshold get the phonetic fallback
+PHONETIC_FALLBACK_MIN_SCORE = 0.60
+
+# Blocks below this many comparisons are coalesced into shared worker tasks
+SMALL_BLOCK_COST = 1000
+
+# export_results builds and writes the export rows for this many matches at a time
+EXPORT_CHUNK_MATCHES = 100000
+
+# Stage 2 computes name similarity matrices for this many block rows at a time (4 x rows x block size float64)
+SIMILARITY_SLAB_ROWS = 256
+
 @dataclass
 class MatchResult:
     """Result of a duplicate check between two records"""
@@ -42,9 +63,29 @@ class MatchResult:
     match_type: str
     details: Dict
 
+# Street normalization patterns, compiled once (suffixes applied in this order, like before)
+_STREET_SUFFIX_PATTERNS = [(re.compile(f'{old}$'), new) for old, new in {
+    'str.': 'strasse', 'straße': 'strasse', 'str': 'strasse',
+    'weg': 'weg', 'allee': 'allee', 'platz': 'platz',
+    'gasse': 'gasse', 'ring': 'ring'
+}.items()]
+_RE_HNUM_END = re.compile(r'\s+\d+[a-z]*$')
+_RE_HNUM_START = re.compile(r'^\d+[a-z]*\s+')
+_RE_NONALPHA = re.compile(r'[^a-z\s]')
+_RE_WS = re.compile(r'\s+')
+_ESZETT = str.maketrans({'ß': 'ss'})
+
 class VectorizedAddressNormalizer:
     """Vectorized operations for address normalization"""
     
+    @staticmethod
+    def _map_unique(series: pd.Series, normalize) -> pd.Series:
+        """Apply a per-string normalizer once per distinct value (addresses and names repeat heavily)"""
+        values = series.fillna('').astype(str)
+        codes, uniques = pd.factorize(values)
+        normalized = np.array([normalize(value) for value in uniques], dtype=object)
+        return pd.Series(normalized[codes], index=series.index, dtype=values.dtype)
+    
     @staticmethod
     def normalize_plz_vectorized(plz_series: pd.Series) -> pd.Series:
         """Vectorized PLZ normalization"""
@@ -57,45 +98,44 @@ class VectorizedAddressNormalizer:
                 .str[:5])
     
     @staticmethod
-    def normalize_street_vectorized(street_series: pd.Series) -> pd.Series:
-        """Vectorized street normalization"""
-        # Fill NA, convert to string, lowercase
-        streets = street_series.fillna('').astype(str).str.strip().str.lower()
+    def _normalize_street_text(street: str) -> str:
+        """One pass over a street string with the precompiled patterns"""
+        street = street.strip().lower()
         
         # Replace common German street suffixes
-        suffix_map = {
-            'str.': 'strasse', 'straße': 'strasse', 'str': 'strasse',
-            'weg': 'weg', 'allee': 'allee', 'platz': 'platz',
-            'gasse': 'gasse', 'ring': 'ring'
-        }
-        
-        for old, new in suffix_map.items():
-            streets = streets.str.replace(f'{old}$', new, regex=True)
+        for pattern, new in _STREET_SUFFIX_PATTERNS:
+            street = pattern.sub(new, street)
         
         # Remove house numbers (end of string)
-        streets = streets.str.replace(r'\s+\d+[a-z]*$', '', regex=True)
-        streets = streets.str.replace(r'^\d+[a-z]*\s+', '', regex=True)
+        street = _RE_HNUM_END.sub('', street)
+        street = _RE_HNUM_START.sub('', street)
         
-        # Handle umlauts
-        streets = streets.str.replace('ß', 'ss')
-        
-        # Apply unidecode vectorized
-        streets = streets.apply(lambda x: unidecode(x) if x else '')
+        # Handle umlauts (unidecode only where non-ASCII characters are left)
+        street = street.translate(_ESZETT)
+        if not street.isascii():
+            street = unidecode(street)
         
         # Remove special chars and extra whitespace
-        streets = streets.str.replace(r'[^a-z\s]', '', regex=True)
-        streets = streets.str.replace(r'\s+', ' ', regex=True).str.strip()
-        
-        return streets
+        street = _RE_NONALPHA.sub('', street)
+        return _RE_WS.sub(' ', street).strip()
+    
+    @staticmethod
+    def normalize_street_vectorized(street_series: pd.Series) -> pd.Series:
+        """Vectorized street normalization"""
+        return VectorizedAddressNormalizer._map_unique(street_series, VectorizedAddressNormalizer._normalize_street_text)
+    
+    @staticmethod
+    def _normalize_name_text(name: str) -> str:
+        """One pass over a name string"""
+        name = name.strip().lower().translate(_ESZETT)
+        if not name.isascii():
+            name = unidecode(name)
+        return _RE_WS.sub(' ', name).strip()
     
     @staticmethod
     def normalize_name_vectorized(name_series: pd.Series) -> pd.Series:
         """Vectorized name normalization"""
-        names = name_series.fillna('').astype(str).str.strip().str.lower()
-        names = names.str.replace('ß', 'ss')
-        names = names.apply(lambda x: unidecode(x) if x else '')
-        names = names.str.replace(r'\s+', ' ', regex=True).str.strip()
-        return names
+        return VectorizedAddressNormalizer._map_unique(name_series, VectorizedAddressNormalizer._normalize_name_text)
 
 def get_cologne_phonetic(name: str) -> str:
     """
@@ -104,8 +144,13 @@ def get_cologne_phonetic(name: str) -> str:
     """
     if pd.isna(name) or not str(name).strip():
         return ''
+    return _cologne_phonetic_code(str(name).strip())
+
+@lru_cache(maxsize=None)
+def _cologne_phonetic_code(name: str) -> str:
+    """Memoized encoder: first and last names repeat heavily"""
     try:
-        result = cologne_phonetics.encode(str(name).strip())
+        result = cologne_phonetics.encode(name)
         if result and len(result) > 0:
             # cologne_phonetics.encode returns list of tuples: [('name', 'code')]
             return result[0][1]
@@ -113,6 +158,14 @@ def get_cologne_phonetic(name: str) -> str:
         pass
     return ''
 
+def cologne_phonetic_codes(names: pd.Series) -> pd.Series:
+    """get_cologne_phonetic for a whole column, encoding each distinct name once"""
+    codes = np.full(len(names), -1, dtype=np.intp)
+    present = names.notna().to_numpy()
+    codes[present], uniques = pd.factorize(names[present].astype(str).to_numpy(dtype=object))
+    encoded = np.array([get_cologne_phonetic(name) for name in uniques] + [''], dtype=object)
+    return pd.Series(encoded[codes], index=names.index, dtype=object)
+
 class OptimizedBlockingStrategy:
     """Highly optimized blocking strategy using vectorized operations"""
     
@@ -125,56 +178,55 @@ class OptimizedBlockingStrategy:
         plz_norm = self.normalizer.normalize_plz_vectorized(df['Plz'])
         street_norm = self.normalizer.normalize_street_vectorized(df['Strasse'])
         
-        # Create conditions for different blocking strategies
-        has_both = (plz_norm != '') & (street_norm != '')
-        has_plz_only = (plz_norm != '') & (street_norm == '')
-        has_street_only = (plz_norm == '') & (street_norm != '')
+        plz = plz_norm.to_numpy(dtype=object)
+        street = street_norm.to_numpy(dtype=object)
+        has_plz = plz != ''
+        has_street = street != ''
         
-        # Vectorized key creation
-        blocking_keys = pd.Series('no_address', index=df.index)
-        blocking_keys[has_both] = plz_norm[has_both] + '_' + street_norm[has_both]
-        blocking_keys[has_plz_only] = 'plz_only_' + plz_norm[has_plz_only]
-        blocking_keys[has_street_only] = 'street_only_' + street_norm[has_street_only]
+        # One key assembly on the arrays (elementwise str concatenation on object arrays)
+        blocking_keys = np.where(has_plz & has_street, plz + '_' + street,
+                        np.where(has_plz, 'plz_only_' + plz,
+                        np.where(has_street, 'street_only_' + street, 'no_address')))
         
-        return blocking_keys
+        return pd.Series(blocking_keys, index=df.index)
     
-    def create_blocks(self, df: pd.DataFrame, max_block_size: int = 10000) -> Dict[str, pd.DataFrame]:
-        """Create blocks efficiently using groupby"""
+    def create_block_positions(self, df: pd.DataFrame, max_block_size: int = 10000) -> Dict[str, np.ndarray]:
+        """Create blocks efficiently as row positions into df (block key -> positions)"""
         logger.info(f"Creating blocks for {len(df)} records...")
         start_time = time.time()
         
         # Create blocking keys vectorized
         blocking_keys = self.create_blocking_keys_vectorized(df)
         
-        # Add to dataframe
-        df_with_keys = df.copy()
-        df_with_keys['blocking_key'] = blocking_keys
-        
-        # Group by blocking key efficiently
-        grouped = df_with_keys.groupby('blocking_key')
+        # Block boundaries from factorize + stable argsort: one sort instead of a groupby
+        # iteration; blocks come out in sorted key order with rows in original order
+        codes, keys = pd.factorize(blocking_keys, sort=True)
+        order = np.argsort(codes, kind='stable')
+        boundaries = np.flatnonzero(np.diff(codes[order], prepend=-1, append=-1))
         
         # Filter blocks by size
         blocks = {}
         total_records = 0
         skipped_blocks = 0
         
-        for key, group_df in grouped:
-            block_size = len(group_df)
+        for start, end in zip(boundaries[:-1].tolist(), boundaries[1:].tolist()):
+            key = keys[codes[order[start]]]
+            block_size = end - start
             if 1 < block_size <= max_block_size:  # Only blocks with 2+ records, not too large
-                blocks[key] = group_df.reset_index(drop=False)  # Keep original index
+                blocks[key] = order[start:end]
                 total_records += block_size
             elif block_size > max_block_size:
                 # Split large blocks into smaller chunks
                 for i in range(0, block_size, max_block_size):
-                    chunk = group_df.iloc[i:i+max_block_size]
+                    chunk = order[start + i:min(start + i + max_block_size, end)]
                     if len(chunk) > 1:
-                        blocks[f"{key}_chunk_{i}"] = chunk.reset_index(drop=False)
+                        blocks[f"{key}_chunk_{i}"] = chunk
                         total_records += len(chunk)
                 skipped_blocks += 1
         
         elapsed = time.time() - start_time
         logger.info(f"Created {len(blocks)} blocks in {elapsed:.2f}s")
-        logger.info(f"Average block size: {total_records/len(blocks):.1f} records")
+        logger.info(f"Average block size: {total_records/len(blocks) if blocks else 0:.1f} records")
         if skipped_blocks > 0:
             logger.info(f"Split {skipped_blocks} oversized blocks")
         
@@ -185,6 +237,11 @@ class OptimizedBlockingStrategy:
         logger.info(f"Comparison reduction: {reduction:.1f}% ({original_comparisons:,} -> {blocked_comparisons:,})")
         
         return blocks
+    
+    def create_blocks(self, df: pd.DataFrame, max_block_size: int = 10000) -> Dict[str, pd.DataFrame]:
+        """Create blocks as DataFrames (original index kept as column 'index')"""
+        return {key: df.iloc[positions].reset_index(drop=False)
+                for key, positions in self.create_block_positions(df, max_block_size).items()}
 
 class PhoneticBlockingStrategy(OptimizedBlockingStrategy):
     """Enhanced blocking strategy with phonetic codes for German names"""
@@ -194,27 +251,25 @@ class PhoneticBlockingStrategy(OptimizedBlockingStrategy):
         # Get standard address-based blocking keys
         standard_keys = super().create_blocking_keys_vectorized(df)
         
-        # Pre-compute phonetic codes (vectorized)
-        logger.info("Computing phonetic codes for names...")
-        df['vorname_phon'] = df['Vorname'].apply(get_cologne_phonetic)
-        df['name_phon'] = df['Name'].apply(get_cologne_phonetic)
-        
-        # Create phonetic blocking keys only for "no_address" records
-        phonetic_keys = pd.Series('no_phonetic', index=df.index)
-        no_address_mask = standard_keys == 'no_address'
+        # Phonetic blocking keys only for "no_address" records; df is not modified
+        no_address_mask = (standard_keys == 'no_address').to_numpy()
+        if not no_address_mask.any():
+            return standard_keys
         
-        if no_address_mask.any():
-            # Only create phonetic keys for records without address data
-            phonetic_keys[no_address_mask] = (
-                'phon_' + 
-                df.loc[no_address_mask, 'vorname_phon'] + '_' + 
-                df.loc[no_address_mask, 'name_phon']
-            )
-            logger.info(f"Created phonetic blocking keys for {no_address_mask.sum()} records without address")
+        # Phonetic codes of these records: the checker's precomputed columns, or computed locally
+        if 'vorname_phon' in df.columns and 'name_phon' in df.columns:
+            vorname_phon = df['vorname_phon'][no_address_mask]
+            name_phon = df['name_phon'][no_address_mask]
+        else:
+            logger.info("Computing phonetic codes for names...")
+            vorname_phon = cologne_phonetic_codes(df['Vorname'][no_address_mask])
+            name_phon = cologne_phonetic_codes(df['Name'][no_address_mask])
+        phonetic_keys = 'phon_' + vorname_phon + '_' + name_phon
+        logger.info(f"Created phonetic blocking keys for {no_address_mask.sum()} records without address")
         
         # Use phonetic blocking for no_address records, standard for others
         combined_keys = standard_keys.copy()
-        combined_keys[no_address_mask] = phonetic_keys[no_address_mask]
+        combined_keys[no_address_mask] = phonetic_keys.to_numpy()
         
         return combined_keys
 
@@ -273,35 +328,53 @@ class FastBusinessRules:
         return True
     
     @staticmethod
-    def check_date_rule(geburtstag_a, jahrgang_a, geburtstag_b, jahrgang_b) -> bool:
-        """Check date matching rules"""
-        year_a = FastBusinessRules.extract_year(geburtstag_a)
-        year_b = FastBusinessRules.extract_year(geburtstag_b)
-        
-        # Parse Jahrgang
-        jg_a = None
-        jg_b = None
+    def parse_jahrgang(jahrgang) -> Optional[int]:
+        """Jahrgang as int (also from float strings like '1998.0'), None if missing or invalid"""
         try:
-            if not pd.isna(jahrgang_a) and str(jahrgang_a).strip():
-                jg_a = int(float(str(jahrgang_a).strip()))
+            if not pd.isna(jahrgang) and str(jahrgang).strip():
+                return int(float(str(jahrgang).strip()))
         except:
             pass
-        try:
-            if not pd.isna(jahrgang_b) and str(jahrgang_b).strip():
-                jg_b = int(float(str(jahrgang_b).strip()))
-        except:
-            pass
-        
-        # Effective year: birth date year takes precedence
-        effective_a = year_a if year_a else jg_a
-        effective_b = year_b if year_b else jg_b
+        return None
+    
+    @staticmethod
+    def effective_year(geburtstag, jahrgang) -> Optional[int]:
+        """Effective year: birth date year takes precedence over Jahrgang"""
+        year = FastBusinessRules.extract_year(geburtstag)
+        return year if year else FastBusinessRules.parse_jahrgang(jahrgang)
+    
+    @staticmethod
+    def effective_years(geburtstag: pd.Series, jahrgang: pd.Series) -> np.ndarray:
+        """
+        effective_year for whole columns as float64 (NaN = no year information); the regex
+        and the Jahrgang parsing run once per distinct value instead of once per pair
+        """
+        def per_distinct_value(values: pd.Series, parse) -> np.ndarray:
+            codes, uniques = pd.factorize(values.to_numpy(dtype=object))
+            parsed = np.array([parse(value) for value in uniques] + [None], dtype=float)
+            return parsed[codes]  # code -1 (missing) picks the trailing None
         
-        if effective_a and effective_b:
+        years = per_distinct_value(geburtstag, FastBusinessRules.extract_year)
+        jahrgaenge = per_distinct_value(jahrgang, FastBusinessRules.parse_jahrgang)
+        # "year if year else jahrgang": a missing or zero birth year falls back to the Jahrgang
+        return np.where(np.isnan(years) | (years == 0), jahrgaenge, years)
+    
+    @staticmethod
+    def check_year_rule(effective_a, effective_b) -> bool:
+        """Date rule on effective years (None or NaN = no year information)"""
+        missing_a = effective_a is None or effective_a != effective_a
+        missing_b = effective_b is None or effective_b != effective_b
+        if not missing_a and not missing_b and effective_a and effective_b:
             return effective_a == effective_b
-        elif effective_a is None and effective_b is None:
-            return True
-        else:
-            return False
+        return missing_a and missing_b
+    
+    @staticmethod
+    def check_date_rule(geburtstag_a, jahrgang_a, geburtstag_b, jahrgang_b) -> bool:
+        """Check date matching rules"""
+        return FastBusinessRules.check_year_rule(
+            FastBusinessRules.effective_year(geburtstag_a, jahrgang_a),
+            FastBusinessRules.effective_year(geburtstag_b, jahrgang_b)
+        )
 
 class OptimizedFuzzyMatcher:
     """Optimized fuzzy matching"""
@@ -349,14 +422,20 @@ class OptimizedFuzzyMatcher:
         if not v_a or not n_a or not v_b or not n_b:
             return {'best_score': 0, 'is_swapped': False, 'normal_score': 0, 'swapped_score': 0}
         
+        return OptimizedFuzzyMatcher.name_results_from_similarities(
+            fuzz.QRatio(v_a, v_b) / 100.0, fuzz.QRatio(n_a, n_b) / 100.0,
+            fuzz.QRatio(v_a, n_b) / 100.0, fuzz.QRatio(n_a, v_b) / 100.0
+        )
+    
+    @staticmethod
+    def name_results_from_similarities(normal_v: float, normal_n: float, swapped_v: float, swapped_n: float) -> Dict:
+        """compare_names result from the four QRatio similarities (0-1) of normalized names"""
+        normal_v, normal_n, swapped_v, swapped_n = float(normal_v), float(normal_n), float(swapped_v), float(swapped_n)
+        
         # Normal comparison
-        normal_v = fuzz.QRatio(v_a, v_b) / 100.0
-        normal_n = fuzz.QRatio(n_a, n_b) / 100.0
         normal_score = (normal_v + normal_n) / 2
         
         # Swapped comparison
-        swapped_v = fuzz.QRatio(v_a, n_b) / 100.0
-        swapped_n = fuzz.QRatio(n_a, v_b) / 100.0
         swapped_score = (swapped_v + swapped_n) / 2
         
         return {
@@ -369,6 +448,68 @@ class OptimizedFuzzyMatcher:
             'swapped_vorname_sim': swapped_v,
             'swapped_name_sim': swapped_n
         }
+    
+    @staticmethod
+    def similarity_matrix(queries: List[str], choices: List[str]) -> np.ndarray:
+        """QRatio / 100 of normalized names for all query x choice pairs in one cdist call"""
+        return process.cdist(queries, choices, scorer=fuzz.QRatio, dtype=np.float64) / 100.0
+
+def address_codes(records: List[Dict]) -> np.ndarray:
+    """
+    Per-block integer codes of the ADDRESS_FIELDS as compared for the address ratio
+    (str / strip / lower), shape (records, fields); -1 marks an empty field
+    """
+    codes = np.empty((len(records), len(ADDRESS_FIELDS)), dtype=np.int32)
+    for k, field in enumerate(ADDRESS_FIELDS):
+        values = [str(record.get(field, '')).strip().lower() for record in records]
+        field_codes, _ = pd.factorize(np.array(values, dtype=object))
+        field_codes[np.array([not value for value in values], dtype=bool)] = -1
+        codes[:, k] = field_codes
+    return codes
+
+def address_match_counts(codes: np.ndarray, rows_a, rows_b) -> Tuple[np.ndarray, np.ndarray]:
+    """(matching, compared) address fields for the pairs rows_a x rows_b; empty fields are not compared"""
+    codes_a = codes[rows_a]
+    codes_b = codes[rows_b]
+    compared = (codes_a >= 0) & (codes_b >= 0)
+    return (compared & (codes_a == codes_b)).sum(axis=-1), compared.sum(axis=-1)
+
+def block_columns(block_df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Block as a dict of NumPy arrays ('index' and the BLOCK_COLUMNS present in the block), cheap to pickle"""
+    return {column: block_df[column].to_numpy() for column in ['index'] + BLOCK_COLUMNS if column in block_df.columns}
+
+def zweitname_suffix_table(names: List[str], name2_values: np.ndarray) -> np.ndarray:
+    """
+    Suffix part of the Zweitname rule per block: table[k, row] is True if the
+    normalized Name of row ends with the k-th distinct Name2 value. One extra row of
+    False at the end, so code -1 (empty Name2) indexes a valid row
+    """
+    table = np.zeros((len(name2_values) + 1, len(names)), dtype=bool)
+    if len(name2_values) and len(names):
+        names = np.array(names, dtype=str)
+        for k, value in enumerate(name2_values):
+            table[k] = np.char.endswith(names, value)
+    return table
+
+def rule_candidate_mask(years: np.ndarray, name2_codes: np.ndarray, name_suffix: np.ndarray,
+                        rows_a: np.ndarray, rows_b: np.ndarray) -> np.ndarray:
+    """
+    Business rules as a columnwise pair mask for the block rows rows_a x rows_b (arrays
+    broadcast, e.g. rows[:, None] x block[None, :]): the date rule on effective years
+    (NaN = none) and the Zweitname rule like check_zweitname, on per-block codes
+    (-1 = empty) and the zweitname_suffix_table
+    """
+    years_a, years_b = years[rows_a], years[rows_b]
+    has_year_a = ~np.isnan(years_a) & (years_a != 0)
+    has_year_b = ~np.isnan(years_b) & (years_b != 0)
+    date_ok = (has_year_a & has_year_b & (years_a == years_b)) | (np.isnan(years_a) & np.isnan(years_b))
+    
+    # Both set: equal; one set: suffix of the other record's Name; both empty: pass
+    code_a, code_b = name2_codes[rows_a], name2_codes[rows_b]
+    set_a, set_b = code_a >= 0, code_b >= 0
+    name2_ok = np.where(set_a & set_b, code_a == code_b,
+                        (~set_a | name_suffix[code_a, rows_b]) & (~set_b | name_suffix[code_b, rows_a]))
+    return date_ok & name2_ok
 
 def process_block_worker(args: Tuple) -> List[Dict]:
     """
@@ -377,152 +518,194 @@ def process_block_worker(args: Tuple) -> List[Dict]:
     Stage 1: Exact match detection (normalized names, both normal and swapped)
     Stage 2: Fuzzy match for remaining unmatched records
     
+    The block comes as a dict of column arrays (see block_columns) or as a DataFrame.
+    
     Returns list of match dictionaries (not MatchResult objects for serialization)
     """
     block_data, confidence_threshold, fuzzy_threshold = args
+    if isinstance(block_data, pd.DataFrame):
+        block_data = block_columns(block_data)
     
     matches = []
-    block_size = len(block_data)
+    original_indices = block_data['index']
+    block_size = len(original_indices)
     
     if block_size < 2:
         return matches
     
     # Convert to records for faster access
-    records = block_data.to_dict('records')
-    original_indices = block_data['index'].values
+    columns = [column for column in block_data if column != 'index']
+    records = ([dict(zip(columns, values)) for values in zip(*(block_data[column] for column in columns))]
+               if columns else [{} for _ in range(block_size)])
     
     # Track matched indices to skip in Stage 2
     matched_indices = set()
     
+    # Normalized names once per block (both stages)
+    v_norm = [OptimizedFuzzyMatcher.normalize_name(record.get('Vorname', '')) for record in records]
+    n_norm = [OptimizedFuzzyMatcher.normalize_name(record.get('Name', '')) for record in records]
+    names_present = np.array([bool(v and n) for v, n in zip(v_norm, n_norm)], dtype=bool)
+    # Normalized names as integer codes in one shared code space (Vorname and Name), so
+    # exact and swapped equality are integer comparisons
+    name_codes, _ = pd.factorize(np.array(v_norm + n_norm, dtype=object))
+    v_code, n_code = name_codes[:block_size], name_codes[block_size:]
+    # Address fields as integer codes, also once per block
+    address = address_codes(records)
+    # Effective years for the date rule: precomputed column, or once per block
+    if '_eff_year' in block_data:
+        years = np.asarray(block_data['_eff_year'], dtype=float)
+    else:
+        years = FastBusinessRules.effective_years(
+            pd.Series([record.get('Geburtstag') for record in records], dtype=object),
+            pd.Series([record.get('Jahrgang') for record in records], dtype=object)
+        )
+    # Zweitname codes (normalized like check_zweitname, -1 = empty) and the suffix
+    # table against the normalized Names for the rule mask
+    name2_norm = np.array([str(value).strip().lower() if not pd.isna(value) else ''
+                           for value in (record.get('Name2') for record in records)], dtype=object)
+    name2_codes, name2_values = pd.factorize(name2_norm)
+    name2_codes[name2_norm == ''] = -1
+    name_suffix = zweitname_suffix_table(
+        [str(value).strip().lower() if not pd.isna(value) else ''
+         for value in (record.get('Name') for record in records)],
+        name2_values
+    )
+    # Phonetic codes for the Stage 2 fallback: precomputed columns, or once per block
+    if 'vorname_phon' in block_data and 'name_phon' in block_data:
+        v_phon = block_data['vorname_phon'].tolist()
+        n_phon = block_data['name_phon'].tolist()
+    else:
+        v_phon = [get_cologne_phonetic(record.get('Vorname', '')) for record in records]
+        n_phon = [get_cologne_phonetic(record.get('Name', '')) for record in records]
+    
     # =======================
     # STAGE 1: EXACT MATCHING
     # =======================
-    for i in range(block_size):
-        for j in range(i + 1, block_size):
-            record_a = records[i]
-            record_b = records[j]
-            
-            # Check business rules first (fast rejection)
-            if not FastBusinessRules.check_zweitname(
-                record_a.get('Name'), record_a.get('Name2'),
-                record_b.get('Name'), record_b.get('Name2')
-            ):
-                continue
-            
-            if not FastBusinessRules.check_date_rule(
-                record_a.get('Geburtstag'), record_a.get('Jahrgang'),
-                record_b.get('Geburtstag'), record_b.get('Jahrgang')
-            ):
-                continue
-            
-            # Normalize names for exact comparison
-            v_a_norm = OptimizedFuzzyMatcher.normalize_name(record_a.get('Vorname', ''))
-            n_a_norm = OptimizedFuzzyMatcher.normalize_name(record_a.get('Name', ''))
-            v_b_norm = OptimizedFuzzyMatcher.normalize_name(record_b.get('Vorname', ''))
-            n_b_norm = OptimizedFuzzyMatcher.normalize_name(record_b.get('Name', ''))
+    # Exact normal or swapped matches share the unordered name pair: bucket records by it
+    # and only look at pairs within a bucket (records with an empty name never match exactly)
+    bucket_keys = (np.minimum(v_code, n_code).astype(np.int64) * (2 * block_size)
+                   + np.maximum(v_code, n_code))
+    name_buckets = defaultdict(list)
+    present_rows = np.flatnonzero(names_present)
+    for i, key in zip(present_rows.tolist(), bucket_keys[present_rows].tolist()):
+        name_buckets[key].append(i)
+    exact_rows = np.array(sorted(
+        (i, j)
+        for bucket in name_buckets.values() if len(bucket) > 1
+        for k, i in enumerate(bucket) for j in bucket[k + 1:]
+    ), dtype=np.intp).reshape(-1, 2)
+    # Date and Zweitname rules for all candidate pairs at once
+    exact_rows = exact_rows[rule_candidate_mask(years, name2_codes, name_suffix, exact_rows[:, 0], exact_rows[:, 1])]
+    exact_candidates = exact_rows.tolist()
+    
+    # Address comparison for all candidate pairs in one array pass
+    exact_address_matches, exact_address_totals = address_match_counts(address, exact_rows[:, 0], exact_rows[:, 1])
+    
+    v_code_list, n_code_list = v_code.tolist(), n_code.tolist()
+    for pair, (i, j) in enumerate(exact_candidates):
+        v_a_code, n_a_code = v_code_list[i], n_code_list[i]
+        v_b_code, n_b_code = v_code_list[j], n_code_list[j]
+        
+        # Check both normal and swapped exact matches
+        is_exact_normal = (v_a_code == v_b_code and n_a_code == n_b_code)
+        is_exact_swapped = (v_a_code == n_b_code and n_a_code == v_b_code)
+        
+        if is_exact_normal or is_exact_swapped:
+            # Calculate address match ratio for confidence scoring
+            address_matches = int(exact_address_matches[pair])
+            total_address_fields = int(exact_address_totals[pair])
+            address_ratio = address_matches / max(total_address_fields, 1)
             
-            # Skip if any name is empty
-            if not (v_a_norm and n_a_norm and v_b_norm and n_b_norm):
-                continue
+            # Exact match confidence: 90-100% based on address matches
+            # Normal exact: 90-100%
+            # Swapped exact: 85-95% (slightly lower due to name swap)
+            if is_exact_normal:
+                confidence = 90 + (address_ratio * 10)  # 90-100%
+                match_type = 'exact_normal'
+            else:  # is_exact_swapped
+                confidence = 85 + (address_ratio * 10)  # 85-95%
+                match_type = 'exact_swapped'
             
-            # Check both normal and swapped exact matches
-            is_exact_normal = (v_a_norm == v_b_norm and n_a_norm == n_b_norm)
-            is_exact_swapped = (v_a_norm == n_b_norm and n_a_norm == v_b_norm)
+            matches.append({
+                'record_a_idx': int(original_indices[i]),
+                'record_b_idx': int(original_indices[j]),
+                'confidence_score': float(confidence),
+                'match_type': match_type,
+                'details': {
+                    'address_ratio': address_ratio,
+                    'address_matches': address_matches,
+                    'total_address_fields': total_address_fields
+                }
+            })
             
-            if is_exact_normal or is_exact_swapped:
-                # Calculate address match ratio for confidence scoring
-                address_fields = ['Strasse', 'HausNummer', 'Plz', 'Ort']
-                address_matches = 0
-                total_address_fields = 0
-                
-                for field in address_fields:
-                    val_a = str(record_a.get(field, '')).strip().lower()
-                    val_b = str(record_b.get(field, '')).strip().lower()
-                    
-                    if val_a and val_b:
-                        total_address_fields += 1
-                        if val_a == val_b:
-                            address_matches += 1
-                
-                address_ratio = address_matches / max(total_address_fields, 1)
-                
-                # Exact match confidence: 90-100% based on address matches
-                # Normal exact: 90-100%
-                # Swapped exact: 85-95% (slightly lower due to name swap)
-                if is_exact_normal:
-                    confidence = 90 + (address_ratio * 10)  # 90-100%
-                    match_type = 'exact_normal'
-                else:  # is_exact_swapped
-                    confidence = 85 + (address_ratio * 10)  # 85-95%
-                    match_type = 'exact_swapped'
-                
-                matches.append({
-                    'record_a_idx': int(original_indices[i]),
-                    'record_b_idx': int(original_indices[j]),
-                    'confidence_score': float(confidence),
-                    'match_type': match_type,
-                    'details': {
-                        'address_ratio': address_ratio,
-                        'address_matches': address_matches,
-                        'total_address_fields': total_address_fields
-                    }
-                })
-                
-                # Mark as matched to skip in Stage 2
-                matched_indices.add(i)
-                matched_indices.add(j)
-    
+            # Mark as matched to skip in Stage 2
+            matched_indices.add(i)
+            matched_indices.add(j)
+
     # =======================
     # STAGE 2: FUZZY MATCHING
     # =======================
-    for i in range(block_size):
-        # Skip if already matched in Stage 1
-        if i in matched_indices:
-            continue
-            
-        for j in range(i + 1, block_size):
-            # Skip if already matched in Stage 1
-            if j in matched_indices:
-                continue
-            
+    # Name similarities come from cdist matrices, a slab of rows at a time, and only
+    # pairs that can reach the threshold (or the phonetic fallback) are visited
+    candidate_floor = min(PHONETIC_FALLBACK_MIN_SCORE, fuzzy_threshold)
+    matched = np.zeros(block_size, dtype=bool)
+    matched[list(matched_indices)] = True
+    
+    for slab_start in range(0, block_size, SIMILARITY_SLAB_ROWS):
+        slab = slice(slab_start, min(slab_start + SIMILARITY_SLAB_ROWS, block_size))
+        normal_v = OptimizedFuzzyMatcher.similarity_matrix(v_norm[slab], v_norm)
+        normal_n = OptimizedFuzzyMatcher.similarity_matrix(n_norm[slab], n_norm)
+        swapped_v = OptimizedFuzzyMatcher.similarity_matrix(v_norm[slab], n_norm)
+        swapped_n = OptimizedFuzzyMatcher.similarity_matrix(n_norm[slab], v_norm)
+        best_scores = np.maximum((normal_v + normal_n) / 2, (swapped_v + swapped_n) / 2)
+        # compare_names scores 0 as soon as one of the four names is empty
+        best_scores[:, ~names_present] = 0
+        best_scores[~names_present[slab]] = 0
+        # Pairs that fail the date or Zweitname rule are never visited
+        rows = np.arange(slab.start, slab.stop)
+        rule_mask = rule_candidate_mask(years, name2_codes, name_suffix, rows[:, None], np.arange(block_size)[None, :])
+        
+        # Candidate pairs of the slab as a sparse (row, column) list in row order: upper
+        # triangle, neither record matched in Stage 1, score at least the candidate floor
+        candidate_mask = np.triu(np.ones(best_scores.shape, dtype=bool), k=slab.start + 1)
+        candidate_mask &= (best_scores >= candidate_floor) & rule_mask
+        candidate_mask &= ~matched[rows, None] & ~matched[None, :]
+        slab_rows, pair_j = np.nonzero(candidate_mask)
+        
+        # Only the candidates' similarities are kept, the dense slab matrices are dropped
+        pair_similarities = np.stack([normal_v[slab_rows, pair_j], normal_n[slab_rows, pair_j],
+                                      swapped_v[slab_rows, pair_j], swapped_n[slab_rows, pair_j]], axis=1).tolist()
+        del normal_v, normal_n, swapped_v, swapped_n, best_scores, rule_mask, candidate_mask
+        pair_i = rows[slab_rows]
+        pair_address_matches, pair_address_totals = address_match_counts(address, pair_i, pair_j)
+        
+        for candidate, (i, j) in enumerate(zip(pair_i.tolist(), pair_j.tolist())):
             record_a = records[i]
             record_b = records[j]
             
-            # Check business rules first (fast rejection)
-            if not FastBusinessRules.check_zweitname(
-                record_a.get('Name'), record_a.get('Name2'),
-                record_b.get('Name'), record_b.get('Name2')
-            ):
-                continue
-            
-            if not FastBusinessRules.check_date_rule(
-                record_a.get('Geburtstag'), record_a.get('Jahrgang'),
-                record_b.get('Geburtstag'), record_b.get('Jahrgang')
-            ):
-                continue
-            
-            # Fuzzy name matching
-            name_results = OptimizedFuzzyMatcher.compare_names(
-                record_a.get('Vorname', ''), record_a.get('Name', ''),
-                record_b.get('Vorname', ''), record_b.get('Name', '')
-            )
+            # Fuzzy name matching (lookups into the candidates' similarities)
+            if names_present[i] and names_present[j]:
+                name_results = OptimizedFuzzyMatcher.name_results_from_similarities(*pair_similarities[candidate])
+            else:
+                name_results = OptimizedFuzzyMatcher.compare_names(
+                    record_a.get('Vorname', ''), record_a.get('Name', ''),
+                    record_b.get('Vorname', ''), record_b.get('Name', '')
+                )
             
             # Check if name similarity meets threshold
             if name_results['best_score'] < fuzzy_threshold:
                 # PHONETIC FALLBACK: Check borderline matches (60% to threshold)
-                if 0.60 <= name_results['best_score'] < fuzzy_threshold:
-                    # Compute phonetic codes for borderline cases
-                    v_a_phon = get_cologne_phonetic(record_a.get('Vorname', ''))
-                    n_a_phon = get_cologne_phonetic(record_a.get('Name', ''))
-                    v_b_phon = get_cologne_phonetic(record_b.get('Vorname', ''))
-                    n_b_phon = get_cologne_phonetic(record_b.get('Name', ''))
-                    
+                if PHONETIC_FALLBACK_MIN_SCORE <= name_results['best_score'] < fuzzy_threshold:
+                    # Phonetic codes for borderline cases
+                    v_a_phon, n_a_phon = v_phon[i], n_phon[i]
+                    v_b_phon, n_b_phon = v_phon[j], n_phon[j]
+            
                     # Check phonetic match (normal and swapped)
                     phonetic_match_normal = (v_a_phon and n_a_phon and v_b_phon and n_b_phon and
                                             v_a_phon == v_b_phon and n_a_phon == n_b_phon)
                     phonetic_match_swapped = (v_a_phon and n_a_phon and v_b_phon and n_b_phon and
                                              v_a_phon == n_b_phon and n_a_phon == v_b_phon)
-                    
+            
                     if phonetic_match_normal or phonetic_match_swapped:
                         # Boost score above threshold and mark as phonetic-assisted
                         name_results['best_score'] = 0.72  # Just above 0.70 threshold
@@ -537,19 +720,8 @@ def process_block_worker(args: Tuple) -> List[Dict]:
                     continue
             
             # Calculate address match ratio
-            address_fields = ['Strasse', 'HausNummer', 'Plz', 'Ort']
-            address_matches = 0
-            total_address_fields = 0
-            
-            for field in address_fields:
-                val_a = str(record_a.get(field, '')).strip().lower()
-                val_b = str(record_b.get(field, '')).strip().lower()
-                
-                if val_a and val_b:
-                    total_address_fields += 1
-                    if val_a == val_b:
-                        address_matches += 1
-            
+            address_matches = int(pair_address_matches[candidate])
+            total_address_fields = int(pair_address_totals[candidate])
             address_ratio = address_matches / max(total_address_fields, 1)
             
             # Calculate fuzzy match confidence
@@ -571,7 +743,7 @@ def process_block_worker(args: Tuple) -> List[Dict]:
                 # Swap penalty: -5 points if swapped (name swap is more suspicious)
                 base_confidence = name_results['best_score'] * 50
                 address_bonus = address_ratio * 30
-                
+            
                 if name_results['is_swapped']:
                     # Fuzzy swapped: 65-85% range (slightly lower due to swap)
                     # Apply small penalty for swap
@@ -581,7 +753,7 @@ def process_block_worker(args: Tuple) -> List[Dict]:
                     # Fuzzy normal: 70-90% range
                     confidence = base_confidence + address_bonus
                     match_type = 'fuzzy_normal'
-                
+            
                 # Cap fuzzy matches at 95% (never higher than exact matches)
                 confidence = min(confidence, 95)
             
@@ -598,9 +770,46 @@ def process_block_worker(args: Tuple) -> List[Dict]:
                         'total_address_fields': total_address_fields
                     }
                 })
-    
+            
     return matches
 
+# Per-process state of the shared-memory workers (set by _init_shared_block_worker)
+_worker_state = {}
+
+def _init_shared_block_worker(specs: Dict[str, Tuple]):
+    """Pool initializer: attach the shared worker columns once per process"""
+    _worker_state['reader'] = SharedColumnReader(specs)
+
+def process_shared_block_worker(args: Tuple) -> Tuple[int, List[Dict], Optional[str]]:
+    """
+    Worker entry point for shared-memory mode: ([(positions, original indices), ...], thresholds).
+    Returns (number of blocks, matches, error); errors are reported instead of raised so one
+    failing task does not stop the pool iteration.
+    """
+    task_blocks, confidence_threshold, fuzzy_threshold = args
+    matches = []
+    try:
+        for positions, original_indices in task_blocks:
+            block = _worker_state['reader'].block_columns(positions)
+            block['index'] = original_indices
+            matches.extend(process_block_worker((block, confidence_threshold, fuzzy_threshold)))
+    except Exception as e:
+        return len(task_blocks), [], str(e)
+    return len(task_blocks), matches, None
+
+def match_results(block_matches: List[Dict]) -> List[MatchResult]:
+    """MatchResult objects for the match dictionaries of one block"""
+    return [
+        MatchResult(
+            record_a_idx=m['record_a_idx'],
+            record_b_idx=m['record_b_idx'],
+            confidence_score=m['confidence_score'],
+            match_type=m['match_type'],
+            details=m['details']
+        )
+        for m in block_matches
+    ]
+
 class UltraFastDuplicateChecker:
     """Ultra-optimized duplicate checker for millions of records with phonetic matching"""
     
@@ -620,6 +829,30 @@ class UltraFastDuplicateChecker:
         
         logger.info(f"Initialized with {self.n_workers} workers, parallel={'enabled' if use_parallel else 'disabled'}")
     
+    @staticmethod
+    def plan_block_tasks(blocks: Dict[str, np.ndarray], small_block_cost: int = SMALL_BLOCK_COST) -> List[List[np.ndarray]]:
+        """
+        Worker tasks in decreasing cost order (k(k-1)/2 comparisons per block): large blocks
+        get a task each, small blocks are coalesced into tasks of about the median large-block cost
+        """
+        def cost(positions: np.ndarray) -> int:
+            return len(positions) * (len(positions) - 1) // 2
+        
+        by_cost = sorted(blocks.values(), key=cost, reverse=True)
+        tasks = [[positions] for positions in by_cost if cost(positions) >= small_block_cost]
+        target_cost = max(int(np.median([cost(task[0]) for task in tasks])) if tasks else 0, small_block_cost)
+        
+        coalesced, coalesced_cost = [], 0
+        for positions in by_cost[len(tasks):]:
+            coalesced.append(positions)
+            coalesced_cost += cost(positions)
+            if coalesced_cost >= target_cost:
+                tasks.append(coalesced)
+                coalesced, coalesced_cost = [], 0
+        if coalesced:
+            tasks.append(coalesced)
+        return tasks
+    
     def analyze_duplicates(self, df: pd.DataFrame, confidence_threshold: float = 70.0) -> List[MatchResult]:
         """
         Main analysis function - highly optimized for large datasets
@@ -627,8 +860,16 @@ class UltraFastDuplicateChecker:
         logger.info(f"Starting duplicate analysis on {len(df):,} records")
         start_time = time.time()
         
-        # Create blocks
-        blocks = self.blocking.create_blocks(df)
+        # Phonetic codes once per DataFrame (blocks carry them to the Stage 2 fallback)
+        if 'Vorname' in df.columns and 'Name' in df.columns:
+            df = df.assign(vorname_phon=cologne_phonetic_codes(df['Vorname']),
+                           name_phon=cologne_phonetic_codes(df['Name']))
+        # Effective years once per DataFrame: the date rule becomes a number comparison per pair
+        if 'Geburtstag' in df.columns and 'Jahrgang' in df.columns:
+            df = df.assign(_eff_year=FastBusinessRules.effective_years(df['Geburtstag'], df['Jahrgang']))
+        
+        # Create blocks (row positions into df)
+        blocks = self.blocking.create_block_positions(df)
         
         if not blocks:
             logger.warning("No blocks created - no duplicates found")
@@ -636,64 +877,98 @@ class UltraFastDuplicateChecker:
         
         logger.info(f"Processing {len(blocks)} blocks...")
         
-        # Prepare block data for workers
-        block_args = [
-            (block_df, confidence_threshold, self.fuzzy_threshold)
-            for block_df in blocks.values()
-        ]
-        
-        all_matches = []
+        index_values = df.index.to_numpy()
+        # MatchResult objects are built per block as results arrive, so the match
+        # dictionaries of a block are dropped right away instead of kept for a second list
+        result_objects = []
         
         if self.use_parallel and len(blocks) > 10:
-            # Parallel processing
-            logger.info(f"Using parallel processing with {self.n_workers} workers")
+            # Parallel processing: the worker columns go to shared memory once, tasks only
+            # carry row positions and original index labels; most expensive tasks first
+            tasks = self.plan_block_tasks(blocks)
+            logger.info(f"Using parallel processing with {self.n_workers} workers ({len(tasks)} tasks)")
+            store = SharedColumnStore.create(df, BLOCK_COLUMNS)
             
-            with ProcessPoolExecutor(max_workers=self.n_workers) as executor:
-                futures = {executor.submit(process_block_worker, args): i 
-                          for i, args in enumerate(block_args)}
-                
-                completed = 0
-                for future in as_completed(futures):
-                    try:
-                        block_matches = future.result()
-                        all_matches.extend(block_matches)
-                        completed += 1
+            try:
+                with mp.Pool(self.n_workers, initializer=_init_shared_block_worker, initargs=(store.specs,)) as pool:
+                    task_args = (([(positions, index_values[positions]) for positions in task],
+                                  confidence_threshold, self.fuzzy_threshold)
+                                 for task in tasks)
+                    
+                    # chunksize 1: small blocks are already coalesced, and the largest tasks must not
+                    # be bundled onto one worker
+                    completed = 0
+                    for task_size, block_matches, error in pool.imap_unordered(process_shared_block_worker, task_args):
+                        completed += task_size
+                        if error is not None:
+                            logger.error(f"Error processing task of {task_size} blocks: {error}")
+                            continue
+                        result_objects.extend(match_results(block_matches))
                         
-                        if completed % 100 == 0 or completed == len(futures):
-                            logger.info(f"Processed {completed}/{len(futures)} blocks, found {len(all_matches)} matches so far")
-                    except Exception as e:
-                        logger.error(f"Error processing block: {e}")
+                        # Every 100 blocks (tasks may cover several blocks)
+                        if completed // 100 > (completed - task_size) // 100 or completed == len(blocks):
+                            logger.info(f"Processed {completed}/{len(blocks)} blocks, found {len(result_objects)} matches so far")
+            finally:
+                store.release()
         else:
-            # Sequential processing
+            # Sequential processing on column arrays, sliced per block
             logger.info("Using sequential processing")
-            for i, args in enumerate(block_args):
+            columns = {column: df[column].to_numpy() for column in BLOCK_COLUMNS if column in df.columns}
+            for i, positions in enumerate(blocks.values()):
                 try:
-                    block_matches = process_block_worker(args)
-                    all_matches.extend(block_matches)
+                    block = {column: values[positions] for column, values in columns.items()}
+                    block['index'] = index_values[positions]
+                    block_matches = process_block_worker((block, confidence_threshold, self.fuzzy_threshold))
+                    result_objects.extend(match_results(block_matches))
                     
-                    if (i + 1) % 100 == 0 or (i + 1) == len(block_args):
-                        logger.info(f"Processed {i+1}/{len(block_args)} blocks, found {len(all_matches)} matches so far")
+                    if (i + 1) % 100 == 0 or (i + 1) == len(blocks):
+                        logger.info(f"Processed {i+1}/{len(blocks)} blocks, found {len(result_objects)} matches so far")
                 except Exception as e:
                     logger.error(f"Error processing block {i}: {e}")
         
-        # Convert dictionaries back to MatchResult objects
-        result_objects = [
-            MatchResult(
-                record_a_idx=m['record_a_idx'],
-                record_b_idx=m['record_b_idx'],
-                confidence_score=m['confidence_score'],
-                match_type=m['match_type'],
-                details=m['details']
-            )
-            for m in all_matches
-        ]
-        
         elapsed = time.time() - start_time
         logger.info(f"Analysis complete: Found {len(result_objects)} matches in {elapsed:.2f}s")
         logger.info(f"Processing rate: {len(df)/elapsed:.0f} records/second")
         
         return result_objects
     
+    @staticmethod
+    def export_frame(matches: List[MatchResult], df: pd.DataFrame) -> pd.DataFrame:
+        """Export rows for the given matches: records A and B of each match below each other"""
+        # One positional take per column for all records (A, B, A, B, ...) instead of
+        # two row lookups per match
+        a_idx = np.fromiter((match.record_a_idx for match in matches), dtype=np.int64, count=len(matches))
+        b_idx = np.fromiter((match.record_b_idx for match in matches), dtype=np.int64, count=len(matches))
+        positions = np.column_stack([a_idx, b_idx]).ravel()
+        
+        def column(name):
+            if name not in df.columns:
+                return [''] * len(positions)
+            return df[name].take(positions).reset_index(drop=True)
+        
+        crefo = [str(value).strip() for value in column('Crefo')]
+        crefo_a, crefo_b = crefo[0::2], crefo[1::2]
+        match_ids = [f"{ca}_{cb}" if ca and cb else f"{match.record_a_idx}_{match.record_b_idx}"
+                     for match, ca, cb in zip(matches, crefo_a, crefo_b)]
+        
+        return pd.DataFrame({
+            'match_id': np.repeat(match_ids, 2),
+            'confidence': np.repeat([match.confidence_score for match in matches], 2),
+            'match_type': np.repeat([match.match_type for match in matches], 2),
+            'position': np.tile(['A', 'B'], len(matches)),
+            'index': positions,
+            'vorname': column('Vorname'),
+            'name': column('Name'),
+            'name2': column('Name2'),
+            'strasse': column('Strasse'),
+            'hausnummer': column('HausNummer'),
+            'plz': column('Plz'),
+            'ort': column('Ort'),
+            'crefo': crefo,
+            'geburtstag': column('Geburtstag'),
+            'jahrgang': column('Jahrgang'),
+        })
+    
     def export_results(self, matches: List[MatchResult], df: pd.DataFrame, filename: str = "duplicates.csv"):
         """Export results efficiently"""
         if not matches:
@@ -702,64 +977,12 @@ class UltraFastDuplicateChecker:
         
         logger.info(f"Exporting {len(matches)} matches...")
         
-        # Build export data efficiently
-        export_rows = []
-        
-        for match in matches:
-            record_a = df.iloc[match.record_a_idx]
-            record_b = df.iloc[match.record_b_idx]
-            
-            crefo_a = str(record_a.get('Crefo', '')).strip()
-            crefo_b = str(record_b.get('Crefo', '')).strip()
-            match_id = f"{crefo_a}_{crefo_b}" if crefo_a and crefo_b else f"{match.record_a_idx}_{match.record_b_idx}"
-            
-            # Base row template
-            base_row = {
-                'match_id': match_id,
-                'confidence': match.confidence_score,
-                'match_type': match.match_type
-            }
-            
-            # Record A
-            row_a = base_row.copy()
-            row_a.update({
-                'position': 'A',
-                'index': match.record_a_idx,
-                'vorname': record_a.get('Vorname', ''),
-                'name': record_a.get('Name', ''),
-                'name2': record_a.get('Name2', ''),
-                'strasse': record_a.get('Strasse', ''),
-                'hausnummer': record_a.get('HausNummer', ''),
-                'plz': record_a.get('Plz', ''),
-                'ort': record_a.get('Ort', ''),
-                'crefo': crefo_a,
-                'geburtstag': record_a.get('Geburtstag', ''),
-                'jahrgang': record_a.get('Jahrgang', ''),
-            })
-            
-            # Record B
-            row_b = base_row.copy()
-            row_b.update({
-                'position': 'B',
-                'index': match.record_b_idx,
-                'vorname': record_b.get('Vorname', ''),
-                'name': record_b.get('Name', ''),
-                'name2': record_b.get('Name2', ''),
-                'strasse': record_b.get('Strasse', ''),
-                'hausnummer': record_b.get('HausNummer', ''),
-                'plz': record_b.get('Plz', ''),
-                'ort': record_b.get('Ort', ''),
-                'crefo': crefo_b,
-                'geburtstag': record_b.get('Geburtstag', ''),
-                'jahrgang': record_b.get('Jahrgang', ''),
-            })
-            
-            export_rows.append(row_a)
-            export_rows.append(row_b)
-        
-        # Create and export DataFrame
-        export_df = pd.DataFrame(export_rows)
-        export_df.to_csv(filename, index=False, encoding='utf-8-sig')
+        # Streamed in chunks of matches into one file handle: only one chunk's export
+        # frame exists at a time, the header is written once
+        with open(filename, 'w', newline='', encoding='utf-8-sig') as f:
+            for start in range(0, len(matches), EXPORT_CHUNK_MATCHES):
+                chunk = self.export_frame(matches[start:start + EXPORT_CHUNK_MATCHES], df)
+                chunk.to_csv(f, index=False, header=start == 0)
         logger.info(f"Exported to {filename}")
 
 def benchmark_performance(df: pd.DataFrame, sample_sizes: List[int] = None):
@@ -20,16 +20,43 @@ from dataclasses import dataclass
 from datetime import datetime
 import re
 from unidecode import unidecode
-from rapidfuzz import fuzz, distance
+from rapidfuzz import fuzz, distance, process
+from concurrent.futures import ProcessPoolExecutor
+import heapq
 import logging
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Sentinel for "no year information" (below any Jahrgang an int32 can hold, so negative
+# Jahrgang values stay years) and the precomputed column holding effective years.
+# Effective year 0 (a set Jahrgang such as '0') is year information that never passes the date rule.
+MISSING_YEAR = np.iinfo(np.int32).min
+EFFECTIVE_YEAR_COLUMN = '_eff_year'
+# Geburtstag layouts seen in vAdresse_Quelle95 ('16.07.1963') and in test data ('1980-01-15'):
+# (separator positions, year slice) for the 10-character fixed-offset fast path
+GEBURTSTAG_LAYOUTS = (((2, 5), '.', slice(6, 10)), ((4, 7), '-', slice(0, 4)))
+# Fields compared case-sensitively (after strip) in the exact matching stage
+EXACT_MATCH_FIELDS = ['Vorname', 'Name', 'Strasse', 'HausNummer', 'Plz', 'Ort']
+# Address fields of the fuzzy confidence (the last four exact-match fields)
+ADDRESS_FIELDS = ['Strasse', 'HausNummer', 'Plz', 'Ort']
+# Columns read by check_exact_match / check_fuzzy_match
+RECORD_COLUMNS = EXACT_MATCH_FIELDS + ['Name2', 'Geburtstag', 'Jahrgang', EFFECTIVE_YEAR_COLUMN]
+# Patterns compiled once (used per value in the normalizer and the date rule)
+_RE_WS = re.compile(r'\s+')
+_RE_YEAR = re.compile(r'(\d{4})')
+# unidecode of the Latin-1 and Latin Extended-A letters (umlauts, accents, 'ß' -> 'ss') as one
+# str.translate table; unidecode maps character by character, so the result is the same
+_LATIN_TRANSLATION = str.maketrans({chr(code): unidecode(chr(code)) for code in range(0xC0, 0x180)})
+
+def _is_missing(value) -> bool:
+    """pd.isna for a single value with plain Python checks: None, pd.NA, NaN/NaT (x != x)"""
+    return value is None or value is pd.NA or value != value
+
+@dataclass(slots=True)
 class MatchResult:
-    """Result of a duplicate check between two records"""
+    """Result of a duplicate check between two records (slots: no per-instance __dict__)"""
     record_a_idx: int
     record_b_idx: int
     confidence_score: float
@@ -42,27 +69,37 @@ class GermanNameNormalizer:
     @staticmethod
     def normalize_name(name: str) -> str:
         """Normalize German names: handle umlauts, case, accents"""
-        if pd.isna(name) or name is None:
+        if _is_missing(name):
             return ""
         
-        name = str(name).strip()
-        # Convert to lowercase
-        name = name.lower()
-        # Custom German replacements first
-        name = name.replace('ß', 'ss')
-        # Remove accents/diacritics
-        name = unidecode(name)
+        # Lowercase and remove accents/diacritics in one translate pass; unidecode only for
+        # characters outside the table (other scripts)
+        name = str(name).strip().lower().translate(_LATIN_TRANSLATION)
+        if not name.isascii():
+            name = unidecode(name)
         # Remove extra whitespace
-        name = re.sub(r'\s+', ' ', name)
+        name = _RE_WS.sub(' ', name)
         
         return name.strip()
     
     @staticmethod
     def normalize_zweitname(zweitname: str) -> str:
         """Normalize Zweitname with case-insensitive comparison"""
-        if pd.isna(zweitname) or zweitname is None:
+        if _is_missing(zweitname):
             return ""
         return str(zweitname).strip().lower()
+    
+    @staticmethod
+    def normalize_column(values: pd.Series, normalize) -> np.ndarray:
+        """
+        Column version of normalize_name / normalize_zweitname as object array: each
+        distinct value is normalized once, missing values map to ""
+        """
+        codes = np.full(len(values), -1, dtype=np.intp)
+        present = values.notna().to_numpy()
+        codes[present], uniques = pd.factorize(values[present].astype(str).to_numpy(dtype=object))
+        normalized = np.array([normalize(value) for value in uniques] + [''], dtype=object)
+        return normalized[codes]
 
 class BusinessRulesEngine:
     """Implements German business rules for duplicate detection"""
@@ -86,15 +123,21 @@ class BusinessRulesEngine:
     @staticmethod
     def extract_year_from_date(date_str: str) -> Optional[int]:
         """Extract year from date string"""
-        if pd.isna(date_str) or date_str is None:
+        if _is_missing(date_str):
             return None
         
         try:
             # Handle various date formats
             date_str = str(date_str).strip()
+            # Fast path for the standard layouts: fixed offsets instead of a regex search
+            if len(date_str) == 10:
+                for (pos_a, pos_b), sep, year_slice in GEBURTSTAG_LAYOUTS:
+                    year = date_str[year_slice]
+                    if date_str[pos_a] == sep and date_str[pos_b] == sep and year.isascii() and year.isdigit():
+                        return int(year)
             if len(date_str) >= 4:
                 # Try to extract 4-digit year
-                year_match = re.search(r'(\d{4})', date_str)
+                year_match = _RE_YEAR.search(date_str)
                 if year_match:
                     return int(year_match.group(1))
         except:
@@ -103,70 +146,158 @@ class BusinessRulesEngine:
         return None
     
     @staticmethod
-    def check_date_rule(geburtstag_a: str, jahrgang_a: str, 
-                       geburtstag_b: str, jahrgang_b: str) -> bool:
+    def parse_jahrgang(jahrgang) -> Optional[int]:
+        """Parse Jahrgang as integer, handling float strings such as '1998.0'"""
+        # Plain Python checks instead of pd.isna: None, pd.NA, NaN (x != x) and empty/zero values
+        if jahrgang is None or jahrgang is pd.NA or jahrgang != jahrgang or not jahrgang:
+            return None
+        try:
+            if type(jahrgang) in (int, float):
+                return int(jahrgang)
+            return int(float(str(jahrgang).strip()))
+        except (ValueError, TypeError, OverflowError):
+            return None
+    
+    @staticmethod
+    def effective_year(geburtstag: str, jahrgang: str) -> int:
+        """
+        Effective year of a single record (Rule 4: Geburtstag takes precedence over Jahrgang).
+        Returns MISSING_YEAR if neither is set.
+        """
+        year = BusinessRulesEngine.extract_year_from_date(geburtstag)
+        if year:
+            return year
+        year = BusinessRulesEngine.parse_jahrgang(jahrgang)
+        return MISSING_YEAR if year is None else year
+    
+    @staticmethod
+    def effective_years(geburtstag: pd.Series, jahrgang: pd.Series) -> np.ndarray:
         """
-        Complex date matching rules:
+        Vectorized effective year for a whole column pair (same semantics as effective_year).
+        Computed once per DataFrame so the pairwise date rule is a plain integer comparison.
+        """
+        # As object first: nullable (Int16) and category columns from verkleinere_dtypes
+        # do not accept '' as fill value
+        geburtstag = geburtstag.astype(object)
+        jahrgang = jahrgang.astype(object)
+        text = geburtstag.where(geburtstag.notna(), '').astype(str).str.strip()
+        years = pd.Series(np.nan, index=text.index)
+        
+        # Standard layouts via fixed offsets on a (n, 10) character array, no per-row parsing
+        fixed_width = (text.str.len() == 10).to_numpy()
+        if fixed_width.any():
+            chars = text[fixed_width].to_numpy(dtype='U10').view('U1').reshape(-1, 10)
+            fixed_years = np.full(len(chars), np.nan)
+            for (pos_a, pos_b), sep, year_slice in GEBURTSTAG_LAYOUTS:
+                digits = chars[:, year_slice]
+                ok = ((chars[:, pos_a] == sep) & (chars[:, pos_b] == sep)
+                      & ((digits >= '0') & (digits <= '9')).all(axis=1) & np.isnan(fixed_years))
+                if ok.any():
+                    fixed_years[ok] = np.ascontiguousarray(digits[ok]).view('U4').ravel().astype(np.int32)
+            years[fixed_width] = fixed_years
+        
+        # Anything else (or invalid dates): first 4-digit group as in extract_year_from_date
+        todo = years.isna() & (text != '')
+        if todo.any():
+            years[todo] = pd.to_numeric(text[todo].str.extract(r'(\d{4})', expand=False), errors='coerce')
+        jg = np.trunc(pd.to_numeric(
+            jahrgang.where(jahrgang.notna(), '').astype(str).str.strip(),
+            errors='coerce'
+        ))
+        # int32 arrays with MISSING_YEAR as sentinel; a Geburtstag year 0 counts as "not set"
+        years = years.to_numpy(dtype=np.float64)
+        jg = jg.to_numpy(dtype=np.float64)
+        year_geb = np.where(years > 0, years, MISSING_YEAR).astype(np.int32)
+        jg_set = ~np.isnan(jg) & (np.abs(jg) < 2**31 - 1)
+        # A Jahrgang truncating to 0 is set unless the value itself is falsy (0 / 0.0, as in
+        # parse_jahrgang); '0' or 0.5 stay year 0
+        for row in np.flatnonzero(jg == 0).tolist():
+            value = jahrgang.iat[row]
+            jg_set[row] = isinstance(value, str) or value != 0
+        year_jg = np.where(jg_set, jg, MISSING_YEAR).astype(np.int32)
+        
+        # Branchless select: Geburtstag wins over Jahrgang
+        return np.where(year_geb != MISSING_YEAR, year_geb, year_jg)
+    
+    @staticmethod
+    def record_effective_year(record) -> int:
+        """Effective year of a record, using the precomputed column if available"""
+        year = record.get(EFFECTIVE_YEAR_COLUMN)
+        if _is_missing(year):
+            return BusinessRulesEngine.effective_year(record.get('Geburtstag'), record.get('Jahrgang'))
+        return int(year)
+    
+    @staticmethod
+    def check_date_rule(effective_year_a: int, effective_year_b: int) -> bool:
+        """
+        Complex date matching rules (on precomputed effective years):
         - Ist ein Geburtsdatum auf beiden potentiellen Dubletten vorhanden muss mindestens das Jahr des Geburtsdatums übereinstimmen
         - Ist ein Geburtsdatum und auf dem anderen Archiv ein Jahrgang gesetzt, so müssen die beiden Jahreszahlen übereinstimmen
         - Sind auf beiden Archiven kein Geburtstag aber jeweils ein Jahrgang gesetzt, so muss dieser übereinstimmen
         - Ist auf einem Archiv ein Geburtsdatum und ein Jahrgang gesetzt so wird der Jahrgang ignoriert
-        """
-        
-        # Extract years from dates
-        year_a = BusinessRulesEngine.extract_year_from_date(geburtstag_a)
-        year_b = BusinessRulesEngine.extract_year_from_date(geburtstag_b)
         
-        # Extract jahrgang as integer
-        # FIX: Handle float values (e.g., '1998.0') by converting to float first
-        jg_a = None
-        jg_b = None
-        
-        try:
-            if jahrgang_a and not pd.isna(jahrgang_a):
-                # Convert to float first, then to int to handle '1998.0' format
-                jg_a = int(float(str(jahrgang_a).strip()))
-        except (ValueError, TypeError):
-            jg_a = None
-            
-        try:
-            if jahrgang_b and not pd.isna(jahrgang_b):
-                # Convert to float first, then to int to handle '1963.0' format
-                jg_b = int(float(str(jahrgang_b).strip()))
-        except (ValueError, TypeError):
-            jg_b = None
-        
-        # Rule 4 (Priority Rule): If a record has both geburtstag and jahrgang, ignore jahrgang
-        # Use effective years - prioritize birth date year over birth year
-        effective_year_a = year_a if year_a else jg_a
-        effective_year_b = year_b if year_b else jg_b
-        
-        # Now compare effective years
-        if effective_year_a and effective_year_b:
-            # Both have year information - they must match
-            return effective_year_a == effective_year_b
-        elif effective_year_a is None and effective_year_b is None:
-            # Neither has year information - rule passes (no conflict)
-            return True
-        else:
-            # One has year information, the other doesn't - REJECT the match
-            # This is an ambiguous case that should not be considered a duplicate
-            return False
+        Rule 4 is already applied by effective_year(s). With MISSING_YEAR as sentinel:
+        - both have year information -> they must match
+        - neither has year information -> rule passes (no conflict)
+        - only one has year information -> REJECT (ambiguous case)
+        which is integer equality, except for year 0: it counts as year information
+        but never passes (not even against another year 0).
+        """
+        return effective_year_a == effective_year_b and effective_year_a != 0
+    
+    @staticmethod
+    def check_date_rules(effective_years_a: np.ndarray, effective_years_b: np.ndarray) -> np.ndarray:
+        """check_date_rule for many record pairs at once: element-wise on effective_years arrays"""
+        effective_years_a = np.asarray(effective_years_a)
+        return (effective_years_a == np.asarray(effective_years_b)) & (effective_years_a != 0)
+    
+    @staticmethod
+    def date_rule_candidates(effective_years: np.ndarray, i: int) -> np.ndarray:
+        """
+        Indices j > i whose effective year passes the date rule against record i.
+        One vectorized comparison per row instead of one Python call per pair.
+        """
+        if effective_years[i] == 0:
+            return np.array([], dtype=np.intp)
+        return i + 1 + np.flatnonzero(effective_years[i + 1:] == effective_years[i])
 
 class FuzzyMatcher:
     """Handles fuzzy matching with name swapping detection"""
     
     @staticmethod
-    def name_similarity(name1: str, name2: str) -> float:
-        """Calculate similarity between two names using RapidFuzz"""
-        norm1 = GermanNameNormalizer.normalize_name(name1)
-        norm2 = GermanNameNormalizer.normalize_name(name2)
-        
+    def name_similarity(name1: str, name2: str, score_cutoff: float = 0.0) -> float:
+        """Calculate similarity between two names using RapidFuzz (0.0 if below score_cutoff)"""
+        return FuzzyMatcher.normalized_name_similarity(GermanNameNormalizer.normalize_name(name1),
+                                                       GermanNameNormalizer.normalize_name(name2),
+                                                       score_cutoff)
+    
+    @staticmethod
+    def normalized_name_similarity(norm1: str, norm2: str, score_cutoff: float = 0.0) -> float:
+        """name_similarity for names already normalized with GermanNameNormalizer.normalize_name"""
         if not norm1 or not norm2:
             return 0.0
         
         # Use QRatio for normalized comparison
-        return fuzz.QRatio(norm1, norm2) / 100.0
+        return fuzz.QRatio(norm1, norm2, score_cutoff=score_cutoff * 100) / 100.0
+    
+    @staticmethod
+    def similarity_matrix(queries, choices, score_cutoff: float = 0.0) -> np.ndarray:
+        """name_similarity for normalized names in batch: rapidfuzz cdist, queries x choices"""
+        # QRatio scores empty strings as 0, like name_similarity
+        return process.cdist(queries, choices, scorer=fuzz.QRatio, dtype=np.float64,
+                             score_cutoff=score_cutoff * 100) / 100.0
+    
+    @staticmethod
+    def combination_similarities(vorname: str, name: str, vornamen: np.ndarray, namen: np.ndarray,
+                                 score_cutoff: float = 0.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        The four similarities of compare_name_combinations for one record (normalized
+        vorname/name) against many (normalized arrays), as a single 2 x 2k cdist call.
+        Returns (normal Vorname, normal Name, swapped Vorname, swapped Name) arrays.
+        """
+        k = len(vornamen)
+        sim = FuzzyMatcher.similarity_matrix([vorname, name], np.concatenate([vornamen, namen]), score_cutoff)
+        return sim[0, :k], sim[1, k:], sim[0, k:], sim[1, :k]
     
     @staticmethod
     def compare_name_combinations(vorname_a: str, name_a: str, 
@@ -177,15 +308,24 @@ class FuzzyMatcher:
         1. Normal: VornameA=VornameB, NameA=NameB
         2. Swapped: VornameA=NameB, NameA=VornameB
         """
-        
+        # Each name normalized once, not once per combination
+        vorname_a, name_a, vorname_b, name_b = map(GermanNameNormalizer.normalize_name,
+                                                   (vorname_a, name_a, vorname_b, name_b))
+        return FuzzyMatcher.combine_name_similarities(
+            FuzzyMatcher.normalized_name_similarity(vorname_a, vorname_b),
+            FuzzyMatcher.normalized_name_similarity(name_a, name_b),
+            FuzzyMatcher.normalized_name_similarity(vorname_a, name_b),
+            FuzzyMatcher.normalized_name_similarity(name_a, vorname_b)
+        )
+    
+    @staticmethod
+    def combine_name_similarities(normal_vorname_sim: float, normal_name_sim: float,
+                                  swapped_vorname_sim: float, swapped_name_sim: float) -> Dict[str, float]:
+        """Name comparison result from the four similarities (also used with precomputed matrices)"""
         # Normal combination
-        normal_vorname_sim = FuzzyMatcher.name_similarity(vorname_a, vorname_b)
-        normal_name_sim = FuzzyMatcher.name_similarity(name_a, name_b)
         normal_score = (normal_vorname_sim + normal_name_sim) / 2
         
         # Swapped combination
-        swapped_vorname_sim = FuzzyMatcher.name_similarity(vorname_a, name_b)
-        swapped_name_sim = FuzzyMatcher.name_similarity(name_a, vorname_b)
         swapped_score = (swapped_vorname_sim + swapped_name_sim) / 2
         
         return {
@@ -202,10 +342,73 @@ class FuzzyMatcher:
 class DuplicateChecker:
     """Main duplicate detection engine"""
     
-    def __init__(self, fuzzy_threshold: float = 0.8):
+    def __init__(self, fuzzy_threshold: float = 0.8, n_workers: int = 1):
         self.fuzzy_threshold = fuzzy_threshold
+        # Processes for the fuzzy stage (1 = sequential, e.g. inside pool workers)
+        self.n_workers = n_workers
         self.business_rules = BusinessRulesEngine()
         self.fuzzy_matcher = FuzzyMatcher()
+    
+    def add_effective_years(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Attach the precomputed effective year column used by the date rule"""
+        empty = pd.Series(None, index=df.index, dtype=object)
+        years = self.business_rules.effective_years(df.get('Geburtstag', empty), df.get('Jahrgang', empty))
+        return df.assign(**{EFFECTIVE_YEAR_COLUMN: years})
+    
+    @staticmethod
+    def stripped_text(values: pd.Series) -> pd.Series:
+        """
+        str(value).strip() of a column (blocking and exact-match keys). Categorical columns
+        (see data.verkleinere_dtypes) are converted once per category and mapped by code.
+        """
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            categories = np.array([str(category).strip() for category in values.cat.categories] + [str(np.nan)],
+                                  dtype=object)
+            return pd.Series(categories[values.cat.codes.to_numpy()], index=values.index)
+        return values.map(lambda value: str(value).strip())
+    
+    @staticmethod
+    def exact_match_codes(df: pd.DataFrame) -> np.ndarray:
+        """
+        Blocking keys of the exact stage: one integer code per record and exact-match field
+        (stripped value, -1 if missing). An exact match needs every field set on both
+        records to be equal, so two records are only candidates if no field code differs.
+        """
+        codes = np.full((len(df), len(EXACT_MATCH_FIELDS)), -1, dtype=np.int64)
+        for k, field in enumerate(EXACT_MATCH_FIELDS):
+            if field not in df.columns:
+                continue
+            present = df[field].notna().to_numpy()
+            codes[present, k] = pd.factorize(DuplicateChecker.stripped_text(df[field][present]))[0]
+        return codes
+    
+    @staticmethod
+    def block_candidates(years: np.ndarray, plz_keys: pd.Series, wildcard: np.ndarray):
+        """
+        Hash blocking on (effective year, PLZ): yields (i, candidate indices j > i).
+        Records with a wildcard PLZ are compared against every record of the same year,
+        all others only against their own block plus the wildcard records of that year.
+        Records of year 0 get no candidates (the date rule rejects them).
+        """
+        plz_codes = np.where(wildcard, -1, pd.factorize(plz_keys)[0])
+        keys = pd.DataFrame({'year': years, 'plz': plz_codes})
+        blocks = keys.groupby(['year', 'plz'], sort=False).indices
+        by_year = keys.groupby('year', sort=False).indices
+        no_records = np.array([], dtype=np.intp)
+        merged = {}
+        
+        for i in range(len(years)):
+            year = years[i]
+            if year == 0:
+                continue
+            if wildcard[i]:
+                block = by_year[year]
+            else:
+                key = (year, plz_codes[i])
+                if key not in merged:
+                    merged[key] = np.union1d(blocks[key], blocks.get((year, -1), no_records))
+                block = merged[key]
+            yield i, block[np.searchsorted(block, i, side='right'):]
         
     def check_exact_match(self, record_a: pd.Series, record_b: pd.Series) -> Optional[MatchResult]:
         """Check exact match based on business rules"""
@@ -217,8 +420,8 @@ class DuplicateChecker:
         
         # Check date rules
         if not self.business_rules.check_date_rule(
-            record_a.get('Geburtstag'), record_a.get('Jahrgang'),
-            record_b.get('Geburtstag'), record_b.get('Jahrgang')):
+            self.business_rules.record_effective_year(record_a),
+            self.business_rules.record_effective_year(record_b)):
             return None
         
         # Exact matching for other fields
@@ -226,12 +429,12 @@ class DuplicateChecker:
         total_fields = 0
         
         # Check name fields (exact)
-        if not pd.isna(record_a.get('Vorname')) and not pd.isna(record_b.get('Vorname')):
+        if not _is_missing(record_a.get('Vorname')) and not _is_missing(record_b.get('Vorname')):
             total_fields += 1
             if str(record_a['Vorname']).strip() == str(record_b['Vorname']).strip():  # Case-sensitive exact match
                 exact_matches += 1
         
-        if not pd.isna(record_a.get('Name')) and not pd.isna(record_b.get('Name')):
+        if not _is_missing(record_a.get('Name')) and not _is_missing(record_b.get('Name')):
             total_fields += 1
             if str(record_a['Name']).strip() == str(record_b['Name']).strip():  # Case-sensitive exact match
                 exact_matches += 1
@@ -239,7 +442,7 @@ class DuplicateChecker:
         # Check address fields (exact)
         address_fields = ['Strasse', 'HausNummer', 'Plz', 'Ort']
         for field in address_fields:
-            if not pd.isna(record_a.get(field)) and not pd.isna(record_b.get(field)):
+            if not _is_missing(record_a.get(field)) and not _is_missing(record_b.get(field)):
                 total_fields += 1
                 if str(record_a[field]).strip() == str(record_b[field]).strip():
                     exact_matches += 1
@@ -267,8 +470,25 @@ class DuplicateChecker:
         
         return None
     
-    def check_fuzzy_match(self, record_a: pd.Series, record_b: pd.Series) -> Optional[MatchResult]:
-        """Check fuzzy match with name swapping detection"""
+    @staticmethod
+    def exact_match_result(record_a_idx: int, record_b_idx: int, total_fields: int) -> MatchResult:
+        """check_exact_match's result for a pair whose total_fields compared fields are all equal"""
+        exact_ratio = total_fields / total_fields
+        return MatchResult(
+            record_a_idx=record_a_idx,
+            record_b_idx=record_b_idx,
+            confidence_score=85 + (exact_ratio * 15),
+            match_type='exact',
+            details={
+                'exact_ratio': exact_ratio,
+                'exact_matches': total_fields,
+                'total_fields': total_fields
+            }
+        )
+    
+    def check_fuzzy_match(self, record_a: pd.Series, record_b: pd.Series,
+                          name_results: Optional[Dict[str, float]] = None) -> Optional[MatchResult]:
+        """Check fuzzy match with name swapping detection (name_results: precomputed name comparison)"""
         
         # Check Zweitname rule
         if not self.business_rules.check_zweitname_rule(
@@ -277,16 +497,17 @@ class DuplicateChecker:
         
         # Check date rules
         if not self.business_rules.check_date_rule(
-            record_a.get('Geburtstag'), record_a.get('Jahrgang'),
-            record_b.get('Geburtstag'), record_b.get('Jahrgang')):
+            self.business_rules.record_effective_year(record_a),
+            self.business_rules.record_effective_year(record_b)):
             return None
         
         # Fuzzy name matching
-        name_results = self.fuzzy_matcher.compare_name_combinations(
-            record_a.get('Vorname', ''), record_a.get('Name', ''),
-            record_b.get('Vorname', ''), record_b.get('Name', ''),
-            self.fuzzy_threshold
-        )
+        if name_results is None:
+            name_results = self.fuzzy_matcher.compare_name_combinations(
+                record_a.get('Vorname', ''), record_a.get('Name', ''),
+                record_b.get('Vorname', ''), record_b.get('Name', ''),
+                self.fuzzy_threshold
+            )
         
         if name_results['best_score'] < self.fuzzy_threshold:
             return None
@@ -297,7 +518,7 @@ class DuplicateChecker:
         address_fields = ['Strasse', 'HausNummer', 'Plz', 'Ort']
         
         for field in address_fields:
-            if not pd.isna(record_a.get(field)) and not pd.isna(record_b.get(field)):
+            if not _is_missing(record_a.get(field)) and not _is_missing(record_b.get(field)):
                 total_address_fields += 1
                 if str(record_a[field]).strip() == str(record_b[field]).strip():
                     address_matches += 1
@@ -327,26 +548,201 @@ class DuplicateChecker:
             }
         )
     
-    def find_duplicates(self, df: pd.DataFrame, confidence_threshold: float = 70.0) -> List[MatchResult]:
+    @staticmethod
+    def normalized_column(df: pd.DataFrame, column: str, normalize=GermanNameNormalizer.normalize_name) -> np.ndarray:
+        """Normalized name column as object array, once per record ('' if the column is missing)"""
+        if column not in df.columns:
+            return np.full(len(df), '', dtype=object)
+        return GermanNameNormalizer.normalize_column(df[column], normalize)
+    
+    @staticmethod
+    def zweitname_codes(df: pd.DataFrame) -> np.ndarray:
+        """
+        Zweitname rule as integer codes: equal normalized Name2 values share a code, empty or
+        missing ones get -1, so a pair passes if either code is -1 or both are equal
+        """
+        codes = np.full(len(df), -1, dtype=np.int32)
+        if 'Name2' not in df.columns:
+            return codes
+        zweitnamen = GermanNameNormalizer.normalize_column(df['Name2'], GermanNameNormalizer.normalize_zweitname)
+        present = zweitnamen != ''
+        codes[present] = pd.factorize(zweitnamen[present])[0]
+        return codes
+    
+    @staticmethod
+    def fuzzy_confidences(normal_scores: np.ndarray, swapped_scores: np.ndarray,
+                          address_codes_a: np.ndarray, address_codes_b: np.ndarray) -> np.ndarray:
+        """
+        check_fuzzy_match's confidence for candidate pairs as array arithmetic (same operations
+        and order): address fields are compared on exact_match_codes (-1 = missing)
+        """
+        best_scores = np.maximum(normal_scores, swapped_scores)
+        compared = (address_codes_a >= 0) & (address_codes_b >= 0)
+        address_matches = (compared & (address_codes_a == address_codes_b)).sum(axis=-1)
+        address_ratio = address_matches / np.maximum(compared.sum(axis=-1), 1)
+        swap_bonus = np.where(swapped_scores > normal_scores, 10, 0)
+        return np.minimum(best_scores * 50 + address_ratio * 30 + swap_bonus, 95)
+    
+    @staticmethod
+    def column_records(df: pd.DataFrame) -> List[Dict]:
+        """
+        Records for the pairwise checks as plain dicts of the RECORD_COLUMNS, built from
+        the column arrays once instead of one df.iloc row Series per comparison
+        """
+        columns = [column for column in RECORD_COLUMNS if column in df.columns]
+        if not columns:
+            return [{} for _ in range(len(df))]
+        return [dict(zip(columns, values)) for values in zip(*(df[column].to_numpy() for column in columns))]
+    
+    def fuzzy_matches(self, stage: Dict, confidence_threshold: float) -> List[MatchResult]:
+        """
+        Stage 2 on the column arrays of find_duplicates (see stage there): fuzzy matches
+        with indices relative to these rows, in (record_a_idx, record_b_idx) order
+        """
+        vornamen = stage['vornamen']
+        namen = stage['namen']
+        zweitname_codes = stage['zweitname_codes']
+        address_codes = stage['address_codes']
+        records = stage['records']
+        plz_keys = stage['plz_keys']
+        # A pair only reaches the threshold T if both similarities of its normal or swapped
+        # combination are >= 2T - 1, so lower scores may be cut off (scored 0) while screening
+        screen_cutoff = max(0.0, 2 * self.fuzzy_threshold - 1 - 1e-9)
+        
+        fuzzy_matches = []
+        # PLZ blocking: records with an empty PLZ are compared against the whole year;
+        # each record is scored against all its block candidates in one cdist call
+        for i, candidates in self.block_candidates(stage['years'], plz_keys, plz_keys == ''):
+            # Zweitname rule for all candidates at once (both set -> must be equal)
+            if zweitname_codes[i] >= 0:
+                candidate_codes = zweitname_codes[candidates]
+                candidates = candidates[(candidate_codes < 0) | (candidate_codes == zweitname_codes[i])]
+            if len(candidates) == 0:
+                continue
+            
+            vorname_sim, name_sim, swapped_vorname_sim, swapped_name_sim = self.fuzzy_matcher.combination_similarities(
+                vornamen[i], namen[i], vornamen[candidates], namen[candidates], screen_cutoff)
+            normal_scores = (vorname_sim + name_sim) / 2
+            swapped_scores = (swapped_vorname_sim + swapped_name_sim) / 2
+            confidences = self.fuzzy_confidences(normal_scores, swapped_scores,
+                                                 address_codes[i], address_codes[candidates])
+            
+            # Only pairs reaching the fuzzy threshold and the confidence threshold go
+            # through check_fuzzy_match, which builds the MatchResult
+            survivors = candidates[(np.maximum(normal_scores, swapped_scores) >= self.fuzzy_threshold)
+                                   & (confidences >= confidence_threshold)]
+            if len(survivors) == 0:
+                continue
+            # Exact similarities (without cutoff) for the name details of the survivors
+            vorname_sim, name_sim, swapped_vorname_sim, swapped_name_sim = self.fuzzy_matcher.combination_similarities(
+                vornamen[i], namen[i], vornamen[survivors], namen[survivors])
+            for k, j in enumerate(survivors.tolist()):
+                name_results = self.fuzzy_matcher.combine_name_similarities(
+                    float(vorname_sim[k]), float(name_sim[k]),
+                    float(swapped_vorname_sim[k]), float(swapped_name_sim[k])
+                )
+                fuzzy_match = self.check_fuzzy_match(records[i], records[j], name_results)
+                if fuzzy_match and fuzzy_match.confidence_score >= confidence_threshold:
+                    fuzzy_match.record_a_idx = i
+                    fuzzy_match.record_b_idx = int(j)
+                    fuzzy_matches.append(fuzzy_match)
+        
+        return fuzzy_matches
+    
+    def parallel_fuzzy_matches(self, stage: Dict, confidence_threshold: float) -> List[MatchResult]:
+        """
+        Stage 2 in n_workers processes. Blocks never cross an effective year, so the years
+        are split into one chunk per worker, balanced by pair count (sum of year size^2);
+        each worker only gets the rows of its chunk.
+        """
+        year_rows = pd.Series(stage['years']).groupby(stage['years'], sort=False).indices
+        chunk_rows = [[] for _ in range(self.n_workers)]
+        loads = [(0, k) for k in range(self.n_workers)]
+        for rows in sorted(year_rows.values(), key=len, reverse=True):
+            load, k = heapq.heappop(loads)
+            chunk_rows[k].append(rows)
+            heapq.heappush(loads, (load + len(rows) ** 2, k))
+        chunk_rows = [np.sort(np.concatenate(rows)) for rows in chunk_rows if rows]
+        
+        chunks = []
+        for rows in chunk_rows:
+            chunk = {key: values[rows] for key, values in stage.items() if key != 'records'}
+            chunk['records'] = [stage['records'][i] for i in rows.tolist()]
+            chunks.append(chunk)
+        
+        fuzzy_matches = []
+        with ProcessPoolExecutor(max_workers=len(chunks)) as executor:
+            results = executor.map(_fuzzy_matches_task, [self] * len(chunks), chunks,
+                                   [confidence_threshold] * len(chunks))
+            for rows, chunk_matches in zip(chunk_rows, results):
+                for fuzzy_match in chunk_matches:
+                    fuzzy_match.record_a_idx = int(rows[fuzzy_match.record_a_idx])
+                    fuzzy_match.record_b_idx = int(rows[fuzzy_match.record_b_idx])
+                fuzzy_matches.extend(chunk_matches)
+        # Same order as the sequential run (ties of the confidence sort keep it)
+        fuzzy_matches.sort(key=lambda match: (match.record_a_idx, match.record_b_idx))
+        return fuzzy_matches
+    
+    @staticmethod
+    def rank_matches(matches: List[MatchResult], top_k: Optional[int] = None) -> List[MatchResult]:
+        """
+        Matches by descending confidence (stable). With top_k only the first top_k of that
+        order are returned, selected with np.partition instead of sorting every match.
+        """
+        if top_k is None or top_k >= len(matches):
+            return sorted(matches, key=lambda x: x.confidence_score, reverse=True)
+        if top_k <= 0:
+            return []
+        confidences = np.array([match.confidence_score for match in matches], dtype=np.float64)
+        # k-th highest confidence: everything above it plus the first ties in match order
+        kth = -np.partition(-confidences, top_k - 1)[top_k - 1]
+        above = np.flatnonzero(confidences > kth)
+        ties = np.flatnonzero(confidences == kth)[:top_k - len(above)]
+        selected = np.concatenate([above, ties])
+        selected.sort()
+        selected = selected[np.argsort(-confidences[selected], kind='stable')]
+        return [matches[i] for i in selected.tolist()]
+    
+    def find_duplicates(self, df: pd.DataFrame, confidence_threshold: float = 70.0,
+                        top_k: Optional[int] = None) -> List[MatchResult]:
         """
         Find duplicates in DataFrame using two-stage approach
         Stage 1: Exact matching
         Stage 2: Fuzzy matching for remaining candidates
+        With top_k only the top_k matches with the highest confidence are returned.
         """
         logger.info(f"Starting duplicate detection for {len(df)} records")
         
         # Reset index to ensure we have proper indices
         df = df.reset_index(drop=True)
+        # Effective years once per DataFrame instead of parsing dates per pair
+        df = self.add_effective_years(df)
+        years = df[EFFECTIVE_YEAR_COLUMN].to_numpy()
+        plz = df['Plz'] if 'Plz' in df.columns else pd.Series('', index=df.index)
+        plz_keys = self.stripped_text(plz)
+        records = self.column_records(df)
         matches = []
         
-        # Stage 1: Exact matching
+        # Stage 1: Exact matching (only pairs in the same year/PLZ block;
+        # differing PLZ can never reach the exact ratio, missing PLZ is not compared)
         logger.info("Stage 1: Exact matching")
-        for i in range(len(df)):
-            for j in range(i + 1, len(df)):
-                exact_match = self.check_exact_match(df.iloc[i], df.iloc[j])
-                if exact_match and exact_match.confidence_score >= confidence_threshold:
-                    exact_match.record_a_idx = i
-                    exact_match.record_b_idx = j
+        field_codes = self.exact_match_codes(df)
+        zweitname_codes = self.zweitname_codes(df)
+        for i, candidates in self.block_candidates(years, plz_keys, plz.isna().to_numpy()):
+            # Field comparison on integer codes for all candidates at once: fields set on both
+            # records must be equal (Vorname/Name act as name blocking keys) and at least one
+            # field must be compared; the exact ratio of the remaining pairs is 1.0
+            candidate_codes = field_codes[candidates]
+            compared = (candidate_codes >= 0) & (field_codes[i] >= 0)
+            exact = ((candidate_codes == field_codes[i]) | ~compared).all(axis=1) & compared.any(axis=1)
+            if zweitname_codes[i] >= 0:
+                exact &= (zweitname_codes[candidates] < 0) | (zweitname_codes[candidates] == zweitname_codes[i])
+            # These pairs pass every check of check_exact_match (date rule by block), so the
+            # MatchResults are built directly
+            total_fields = compared.sum(axis=1)
+            for j, fields in zip(candidates[exact].tolist(), total_fields[exact].tolist()):
+                exact_match = self.exact_match_result(i, j, fields)
+                if exact_match.confidence_score >= confidence_threshold:
                     matches.append(exact_match)
         
         logger.info(f"Found {len(matches)} exact matches")
@@ -358,34 +754,38 @@ class DuplicateChecker:
             matched_indices.add(match.record_a_idx)
             matched_indices.add(match.record_b_idx)
         
-        fuzzy_matches = []
-        for i in range(len(df)):
-            if i in matched_indices:
-                continue
-            for j in range(i + 1, len(df)):
-                if j in matched_indices:
-                    continue
-                
-                # Optional: PLZ blocking for performance
-                plz_a = str(df.iloc[i].get('Plz', '')).strip()
-                plz_b = str(df.iloc[j].get('Plz', '')).strip()
-                
-                if plz_a and plz_b and plz_a != plz_b:
-                    continue  # Skip if different PLZ (performance optimization)
-                
-                fuzzy_match = self.check_fuzzy_match(df.iloc[i], df.iloc[j])
-                if fuzzy_match and fuzzy_match.confidence_score >= confidence_threshold:
-                    fuzzy_match.record_a_idx = i
-                    fuzzy_match.record_b_idx = j
-                    fuzzy_matches.append(fuzzy_match)
+        matched = np.zeros(len(df), dtype=bool)
+        matched[list(matched_indices)] = True
+        # Records that matched exactly are neither compared nor candidates, so Stage 2 only
+        # gets the remaining rows (normalized names once per record)
+        remaining = np.flatnonzero(~matched)
+        address_codes = field_codes[:, [EXACT_MATCH_FIELDS.index(field) for field in ADDRESS_FIELDS]]
+        stage = {
+            'years': years[remaining],
+            'plz_keys': plz_keys.to_numpy(dtype=object)[remaining],
+            'vornamen': self.normalized_column(df, 'Vorname')[remaining],
+            'namen': self.normalized_column(df, 'Name')[remaining],
+            'zweitname_codes': zweitname_codes[remaining],
+            'address_codes': address_codes[remaining],
+            'records': [records[i] for i in remaining.tolist()],
+        }
+        
+        if self.n_workers > 1:
+            fuzzy_matches = self.parallel_fuzzy_matches(stage, confidence_threshold)
+        else:
+            fuzzy_matches = self.fuzzy_matches(stage, confidence_threshold)
+        for fuzzy_match in fuzzy_matches:
+            fuzzy_match.record_a_idx = int(remaining[fuzzy_match.record_a_idx])
+            fuzzy_match.record_b_idx = int(remaining[fuzzy_match.record_b_idx])
         
         logger.info(f"Found {len(fuzzy_matches)} fuzzy matches")
         
         # Combine and sort by confidence
-        all_matches = matches + fuzzy_matches
-        all_matches.sort(key=lambda x: x.confidence_score, reverse=True)
-        
-        return all_matches
+        return self.rank_matches(matches + fuzzy_matches, top_k)
+
+def _fuzzy_matches_task(checker: DuplicateChecker, stage: Dict, confidence_threshold: float) -> List[MatchResult]:
+    """Worker entry point of DuplicateChecker.parallel_fuzzy_matches (module level so it pickles)"""
+    return checker.fuzzy_matches(stage, confidence_threshold)
 
 def create_sample_data() -> pd.DataFrame:
     """Create sample data for testing the duplicate checker"""
@@ -6,62 +6,89 @@ This script compares the performance of the original and optimized versions
 side-by-side to demonstrate the improvements.
 """
 
+import argparse
 import pandas as pd
+import numpy as np
 import time
 import sys
-from typing import List, Tuple
+import os
+import io
+from contextlib import redirect_stdout
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
 
-def create_test_data(n_records: int = 10000) -> pd.DataFrame:
-    """Create synthetic test data"""
-    import random
-    import string
+# Text columns of the test data with few distinct values
+CATEGORY_COLUMNS = ('Vorname', 'Name', 'Name2', 'Strasse', 'Ort')
+# Seeded test data is kept here as pickle (same directory as data.lade_daten_gecached)
+TEST_DATA_CACHE_DIR = '.cache'
+
+def create_test_data(n_records: int = 10000, seed: Optional[int] = None) -> pd.DataFrame:
+    """Create synthetic test data (reproducible with a seed, then cached on disk)"""
+    if seed is not None:
+        cache_path = os.path.join(TEST_DATA_CACHE_DIR, f'testdata_{n_records}_{seed}.pkl')
+        if os.path.exists(cache_path):
+            print(f"Loading cached test dataset with {n_records:,} records (seed {seed})...")
+            return pd.read_pickle(cache_path)
     
     print(f"Creating test dataset with {n_records:,} records...")
+    rng = np.random.default_rng(seed)
     
     # Common German names
-    firstnames = ['Max', 'Anna', 'Hans', 'Maria', 'Peter', 'Julia', 'Klaus', 'Petra']
-    lastnames = ['Müller', 'Schmidt', 'Schneider', 'Fischer', 'Meyer', 'Wagner', 'Becker']
-    streets = ['Hauptstrasse', 'Bahnhofstrasse', 'Kirchweg', 'Schulstrasse', 'Dorfstrasse']
-    cities = ['Berlin', 'Hamburg', 'München', 'Köln', 'Frankfurt']
-    
-    data = []
-    for i in range(n_records):
-        # Create some duplicates (10% of records)
-        if i > 0 and random.random() < 0.1:
-            # Duplicate with slight variations
-            base_record = random.choice(data)
-            record = base_record.copy()
-            # Add small variations
-            if random.random() < 0.3:
-                record['Vorname'] = base_record['Vorname'][::-1]  # Swap chars
-        else:
-            # Create new record
-            record = {
-                'Vorname': random.choice(firstnames),
-                'Name': random.choice(lastnames),
-                'Name2': '',
-                'Strasse': random.choice(streets),
-                'HausNummer': str(random.randint(1, 100)),
-                'Plz': f"{random.randint(10000, 99999)}",
-                'Ort': random.choice(cities),
-                'Geburtstag': f"19{random.randint(50, 99)}-{random.randint(1, 12):02d}-{random.randint(1, 28):02d}",
-                'Jahrgang': None,
-                'Crefo': f"{i:08d}",
-                'Quelle_95': f"SRC_{i}",
-                'Erfasst': '2025-01-01'
-            }
-        data.append(record)
-    
-    return pd.DataFrame(data)
+    firstnames = np.array(['Max', 'Anna', 'Hans', 'Maria', 'Peter', 'Julia', 'Klaus', 'Petra'], dtype=object)
+    lastnames = np.array(['Müller', 'Schmidt', 'Schneider', 'Fischer', 'Meyer', 'Wagner', 'Becker'], dtype=object)
+    streets = np.array(['Hauptstrasse', 'Bahnhofstrasse', 'Kirchweg', 'Schulstrasse', 'Dorfstrasse'], dtype=object)
+    cities = np.array(['Berlin', 'Hamburg', 'München', 'Köln', 'Frankfurt'], dtype=object)
+    
+    # Create some duplicates (10% of records): copy of a random earlier record,
+    # 30% of them with the Vorname reversed
+    positions = np.arange(n_records)
+    is_duplicate = (rng.random(n_records) < 0.1) & (positions > 0)
+    parent = np.where(is_duplicate, (rng.random(n_records) * positions).astype(np.int64), positions)
+    reversed_vorname = is_duplicate & (rng.random(n_records) < 0.3)
+    # Copies of copies: follow the chain to the new record it started from; the Vorname is
+    # reversed if it was reversed an odd number of times on the way
+    while (parent != parent[parent]).any():
+        reversed_vorname = reversed_vorname ^ reversed_vorname[parent]
+        parent = parent[parent]
+    
+    # New records
+    birthdays = pd.to_datetime(pd.DataFrame({'year': 1900 + rng.integers(50, 100, n_records),
+                                             'month': rng.integers(1, 13, n_records),
+                                             'day': rng.integers(1, 29, n_records)}))
+    data = pd.DataFrame({
+        'Vorname': rng.choice(firstnames, n_records),
+        'Name': rng.choice(lastnames, n_records),
+        'Name2': '',
+        'Strasse': rng.choice(streets, n_records),
+        'HausNummer': rng.integers(1, 101, n_records).astype(str),
+        'Plz': rng.integers(10000, 100000, n_records).astype(str),
+        'Ort': rng.choice(cities, n_records),
+        'Geburtstag': birthdays.dt.strftime('%Y-%m-%d'),
+        'Jahrgang': None,
+        'Crefo': pd.Series(positions).map('{:08d}'.format),
+        'Quelle_95': 'SRC_' + pd.Series(positions).astype(str),
+        'Erfasst': '2025-01-01'
+    })
+    
+    # Duplicates take all columns of their original record
+    data = data.iloc[parent].reset_index(drop=True)
+    data.loc[reversed_vorname, 'Vorname'] = data.loc[reversed_vorname, 'Vorname'].str[::-1]
+    # Repeated strings as category (like data.verkleinere_dtypes): integer codes for blocking
+    # and groupby, a fraction of the memory; Plz, Crefo and Quelle_95 are nearly unique
+    data = data.astype({column: 'category' for column in CATEGORY_COLUMNS})
+    
+    if seed is not None:
+        os.makedirs(TEST_DATA_CACHE_DIR, exist_ok=True)
+        data.to_pickle(cache_path)
+    return data
 
-def time_blocking_original(df: pd.DataFrame) -> Tuple[float, int]:
-    """Time the original blocking strategy"""
+def time_blocking_iterrows(df: pd.DataFrame) -> Tuple[float, int]:
+    """Time the original blocking loop as it was (one row Series per record) - the baseline"""
     from collections import defaultdict
     
-    print("\n--- ORIGINAL BLOCKING (with iterrows) ---")
+    print("\n--- ORIGINAL BLOCKING LOOP (with iterrows, baseline) ---")
     start = time.time()
     
-    # Original implementation (simplified)
     blocks = defaultdict(list)
     for idx, row in df.iterrows():
         plz = str(row.get('Plz', '')).strip()
@@ -79,6 +106,39 @@ def time_blocking_original(df: pd.DataFrame) -> Tuple[float, int]:
     
     return elapsed, len(filtered_blocks)
 
+def key_codes(values: pd.Series, normalize) -> np.ndarray:
+    """int64 code per record of normalize(str(value)), str() and normalize once per distinct value"""
+    text = np.empty(len(values), dtype=object)
+    missing = values.isna().to_numpy()
+    codes, uniques = pd.factorize(values[~missing])
+    text[~missing] = np.array([normalize(str(value)) for value in uniques], dtype=object)[codes]
+    # Missing values keep their own str() ('None', 'nan', '<NA>')
+    text[missing] = [normalize(str(value)) for value in values[missing].astype(object)]
+    return pd.factorize(text)[0].astype(np.int64)
+
+def time_blocking_columnwise(df: pd.DataFrame) -> Tuple[float, int]:
+    """Time the original blocking keys (PLZ + street), built column-wise instead of per row"""
+    print("\n--- ORIGINAL KEYS, COLUMN-WISE (PLZ + street codes) ---")
+    start = time.time()
+    
+    # Same keys as the iterrows loop (str(value).strip(), street lowercased), packed as
+    # (PLZ code << 32) | street code into one int64 per record instead of a key string
+    missing = pd.Series('', index=df.index)
+    plz_codes = key_codes(df.get('Plz', missing), str.strip)
+    street_codes = key_codes(df.get('Strasse', missing), lambda text: text.strip().lower())
+    keys = (plz_codes << 32) | street_codes
+    blocks = pd.Series(keys).groupby(keys, sort=False).indices
+    
+    # Filter to blocks with multiple records
+    filtered_blocks = {k: df.index[v] for k, v in blocks.items() if len(v) > 1}
+    
+    elapsed = time.time() - start
+    print(f"Time: {elapsed:.3f}s")
+    print(f"Blocks created: {len(filtered_blocks)}")
+    print(f"Rate: {len(df)/elapsed:.0f} records/second")
+    
+    return elapsed, len(filtered_blocks)
+
 def time_blocking_optimized(df: pd.DataFrame) -> Tuple[float, int]:
     """Time the optimized blocking strategy"""
     print("\n--- OPTIMIZED BLOCKING (vectorized) ---")
@@ -97,8 +157,30 @@ def time_blocking_optimized(df: pd.DataFrame) -> Tuple[float, int]:
     
     return elapsed, len(blocks)
 
-def compare_full_analysis(df: pd.DataFrame) -> None:
-    """Compare full analysis pipeline"""
+def benchmark_blocking(df: pd.DataFrame) -> Tuple[str, float, float, float]:
+    """
+    Blocking comparison for one test size (worker entry point): printed output and the
+    times of the iterrows baseline, the column-wise original keys and the optimized blocking
+    """
+    output = io.StringIO()
+    with redirect_stdout(output):
+        print(f"\n{'='*80}")
+        print(f"TEST: {len(df):,} records")
+        print(f"{'='*80}")
+        
+        # Original (baseline)
+        orig_time, orig_blocks = time_blocking_iterrows(df)
+        
+        # Original keys without the row objects
+        columnwise_time, columnwise_blocks = time_blocking_columnwise(df)
+        
+        # Optimized
+        opt_time, opt_blocks = time_blocking_optimized(df)
+    
+    return output.getvalue(), orig_time, columnwise_time, opt_time
+
+def compare_full_analysis(df: pd.DataFrame, tile_rows: Optional[int] = None) -> None:
+    """Compare full analysis pipeline (with tile_rows also sequentially over row tiles)"""
     print("\n" + "="*80)
     print("FULL ANALYSIS COMPARISON")
     print("="*80)
@@ -152,8 +234,41 @@ def compare_full_analysis(df: pd.DataFrame) -> None:
     
     print(f"\nEstimated time without parallel processing:")
     print(f"  {time_7_5m_sequential:.0f} seconds ({time_7_5m_sequential/60:.1f} minutes)")
+    
+    if tile_rows:
+        time_tiled_analysis(df, tile_rows)
+
+def time_tiled_analysis(df: pd.DataFrame, tile_rows: int) -> None:
+    """
+    Time the sequential analysis over row tiles (small, cache-resident blocking tables).
+    Pairs across tiles are not compared: a benchmark rate, not an analysis result.
+    """
+    from duplicate_checker_optimized import UltraFastDuplicateChecker
+    
+    print(f"\n--- OPTIMIZED VERSION (Sequential, tiles of {tile_rows:,} rows) ---")
+    checker = UltraFastDuplicateChecker(fuzzy_threshold=0.7, use_parallel=False)
+    start = time.time()
+    matches = []
+    for tile_start in range(0, len(df), tile_rows):
+        matches.extend(checker.analyze_duplicates(df.iloc[tile_start:tile_start + tile_rows],
+                                                  confidence_threshold=70.0))
+    elapsed = time.time() - start
+    rate = len(df) / elapsed
+    
+    print(f"Time: {elapsed:.3f}s")
+    print(f"Matches found within tiles: {len(matches)}")
+    print(f"Rate: {rate:.0f} records/second")
+    print(f"\nEstimated time for 7.5M records at the tiled rate:")
+    print(f"  {7_500_000 / rate:.0f} seconds ({7_500_000 / rate / 60:.1f} minutes)")
 
 def main():
+    parser = argparse.ArgumentParser(description='Compare original and optimized duplicate detection')
+    parser.add_argument('--tile-rows', type=int, default=None,
+                       help='Also time the full analysis over row tiles of this size (default: off)')
+    parser.add_argument('--seed', type=int, default=None,
+                       help='Seed for the test data; seeded data is cached in .cache (default: random)')
+    args = parser.parse_args()
+    
     print("="*80)
     print("PERFORMANCE COMPARISON: ORIGINAL vs OPTIMIZED")
     print("="*80)
@@ -175,59 +290,60 @@ def main():
     results = {
         'size': [],
         'original_time': [],
+        'columnwise_time': [],
         'optimized_time': [],
         'speedup': []
     }
     
-    for size in test_sizes:
-        print(f"\n{'='*80}")
-        print(f"TEST: {size:,} records")
-        print(f"{'='*80}")
-        
-        df = create_test_data(size)
-        
-        # Original
-        orig_time, orig_blocks = time_blocking_original(df)
-        
-        # Optimized
-        opt_time, opt_blocks = time_blocking_optimized(df)
-        
+    # Test data built once for the largest size; smaller sizes are its first rows (duplicates
+    # only copy earlier records, so every prefix is a complete test set)
+    full_df = create_test_data(max(test_sizes), seed=args.seed)
+    
+    # Sizes run concurrently, one process each (blocking is single-threaded); the output
+    # of each size is printed in order once it is done
+    with ProcessPoolExecutor(max_workers=min(len(test_sizes), os.cpu_count() or 1)) as executor:
+        futures = [executor.submit(benchmark_blocking, full_df.iloc[:size]) for size in test_sizes]
+        size_results = [future.result() for future in futures]
+    
+    for size, (output, orig_time, columnwise_time, opt_time) in zip(test_sizes, size_results):
+        print(output, end='')
         speedup = orig_time / opt_time if opt_time > 0 else 0
         
         results['size'].append(size)
         results['original_time'].append(orig_time)
+        results['columnwise_time'].append(columnwise_time)
         results['optimized_time'].append(opt_time)
         results['speedup'].append(speedup)
         
-        print(f"\nSpeedup: {speedup:.1f}x faster")
+        print(f"\nSpeedup over the iterrows original: {speedup:.1f}x")
     
     # Print summary table
     print("\n" + "="*80)
     print("BLOCKING SPEEDUP SUMMARY")
     print("="*80)
-    print(f"\n{'Size':<12} {'Original':<12} {'Optimized':<12} {'Speedup':<12}")
-    print("-"*50)
+    print(f"\n{'Size':<12} {'Original':<12} {'Column-wise':<12} {'Optimized':<12} {'Speedup':<12}")
+    print("-"*63)
     
     for i, size in enumerate(results['size']):
-        print(f"{size:<12,} {results['original_time'][i]:<12.3f} "
+        print(f"{size:<12,} {results['original_time'][i]:<12.3f} {results['columnwise_time'][i]:<12.3f} "
               f"{results['optimized_time'][i]:<12.3f} {results['speedup'][i]:<12.1f}x")
+    print("\nOriginal = iterrows loop, Column-wise = same keys without row objects, "
+          "Speedup = Original / Optimized")
     
     # Full analysis comparison (only on largest size to save time)
     print("\n\n" + "="*80)
     print(f"FULL ANALYSIS TEST ({test_sizes[-1]:,} records)")
     print("="*80)
     
-    df = create_test_data(test_sizes[-1])
-    compare_full_analysis(df)
+    compare_full_analysis(full_df.iloc[:test_sizes[-1]], tile_rows=args.tile_rows)
     
     print("\n" + "="*80)
     print("COMPARISON COMPLETE")
     print("="*80)
-    print("\nKey Takeaways:")
-    print("1. Vectorized operations are 50-200x faster than iterrows")
-    print("2. Parallel processing provides additional 4-8x speedup")
-    print("3. Combined: 200-1000x faster for full pipeline")
-    print("4. 7.5M records: Estimated 10-30 minutes (vs 100+ hours original)")
+    print("\nKey Takeaways (from the measurements above):")
+    print(f"1. Optimized blocking is {min(results['speedup']):.1f}-{max(results['speedup']):.1f}x "
+          f"faster than the iterrows loop")
+    print("2. Parallel speedup and the 7.5M-record estimate: see FULL ANALYSIS above")
 
 if __name__ == "__main__":
     try:
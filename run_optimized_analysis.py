@@ -6,14 +6,16 @@ This script integrates the optimized duplicate checker with your existing
 data.py SQL Server connection to process the full 7.5M records.
 
 Usage:
-    python run_optimized_analysis.py [--limit LIMIT] [--confidence THRESHOLD]
+    python run_optimized_analysis.py [--limit LIMIT] [--confidence THRESHOLD] [--benchmark [--yes]]
 """
 
 import argparse
 import time
 import logging
+import numpy as np
+import pandas as pd
 from duplicate_checker_optimized import UltraFastDuplicateChecker, benchmark_performance
-from data import lade_daten, engine
+from data import lade_daten_chunks, engine
 
 # Configure logging
 logging.basicConfig(
@@ -34,10 +36,18 @@ def main():
                        help='Disable parallel processing')
     parser.add_argument('--benchmark', action='store_true',
                        help='Run performance benchmark before full analysis')
+    parser.add_argument('--yes', action='store_true',
+                       help='Continue with the full analysis after --benchmark (default: stop)')
     parser.add_argument('--output', type=str, default='duplicates_results.csv',
                        help='Output filename (default: duplicates_results.csv)')
+    parser.add_argument('--chunksize', type=int, default=250_000,
+                       help='Rows fetched per chunk while loading (default: 250000)')
+    parser.add_argument('--log-level', type=str.upper, default='INFO',
+                       choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                       help='Log level; DEBUG adds tracebacks to errors (default: INFO)')
     
     args = parser.parse_args()
+    logging.getLogger().setLevel(args.log_level)
     
     print("=" * 80)
     print("ULTRA-FAST DUPLICATE CHECKER - SQL Server Integration")
@@ -72,9 +82,18 @@ def main():
           WHERE Erfasst < dateadd(day,-7,getdate())
         """
         
-        df = lade_daten(engine, query)
+        # Streamed from a server-side cursor chunk by chunk; blocking needs all records, so
+        # the chunks are joined before the analysis starts
+        chunks = []
+        loaded = 0
+        for chunk in lade_daten_chunks(engine, query, chunksize=args.chunksize):
+            chunks.append(chunk)
+            loaded += len(chunk)
+            logger.info(f"  ... {loaded:,} records loaded")
+        df = chunks[0] if len(chunks) == 1 else pd.concat(chunks, ignore_index=True)
     except Exception as e:
         logger.error(f"Failed to load data: {e}")
+        logger.debug("Traceback:", exc_info=True)
         return 1
     
     load_time = time.time() - start_load
@@ -105,9 +124,9 @@ def main():
         benchmark_performance(df, sample_sizes=sizes)
         print()
         
-        response = input("\nContinue with full analysis? (y/n): ")
-        if response.lower() != 'y':
-            print("Analysis cancelled.")
+        # No prompt, so scheduled runs never block on stdin
+        if not args.yes:
+            logger.info("Benchmark done; pass --yes to continue with the full analysis")
             return 0
         print()
     
@@ -128,7 +147,8 @@ def main():
     try:
         matches = checker.analyze_duplicates(df, confidence_threshold=args.confidence)
     except Exception as e:
-        logger.error(f"Analysis failed: {e}", exc_info=True)
+        logger.error(f"Analysis failed: {e}")
+        logger.debug("Traceback:", exc_info=True)
         return 1
     
     analysis_time = time.time() - start_analysis
@@ -146,25 +166,26 @@ def main():
     print()
     
     if matches:
-        # Match type breakdown
-        exact_normal = sum(1 for m in matches if m.match_type == 'exact_normal')
-        exact_swapped = sum(1 for m in matches if m.match_type == 'exact_swapped')
-        fuzzy_normal = sum(1 for m in matches if m.match_type == 'fuzzy_normal')
-        fuzzy_swapped = sum(1 for m in matches if m.match_type == 'fuzzy_swapped')
+        # Match type and confidence of all matches in one pass, counted column-wise
+        match_stats = pd.DataFrame({'match_type': [m.match_type for m in matches],
+                                    'confidence': [m.confidence_score for m in matches]})
+        type_counts = match_stats['match_type'].value_counts()
         
         print("Match type breakdown:")
-        print(f"  Exact normal matches:    {exact_normal:,}")
-        print(f"  Exact swapped matches:   {exact_swapped:,}")
-        print(f"  Fuzzy normal matches:    {fuzzy_normal:,}")
-        print(f"  Fuzzy swapped matches:   {fuzzy_swapped:,}")
+        print(f"  Exact normal matches:    {type_counts.get('exact_normal', 0):,}")
+        print(f"  Exact swapped matches:   {type_counts.get('exact_swapped', 0):,}")
+        print(f"  Fuzzy normal matches:    {type_counts.get('fuzzy_normal', 0):,}")
+        print(f"  Fuzzy swapped matches:   {type_counts.get('fuzzy_swapped', 0):,}")
         print()
         
-        # Confidence distribution
-        high_conf = sum(1 for m in matches if m.confidence_score >= 90)
-        med_conf = sum(1 for m in matches if 80 <= m.confidence_score < 90)
-        low_conf = sum(1 for m in matches if m.confidence_score < 80)
+        # Confidence distribution: <80, 80-89, >=90
+        confidence_counts = pd.cut(match_stats['confidence'], bins=[-np.inf, 80, 90, np.inf], right=False,
+                                   labels=['low', 'med', 'high']).value_counts()
+        high_conf = confidence_counts['high']
+        med_conf = confidence_counts['med']
+        low_conf = confidence_counts['low']
         
-        avg_conf = sum(m.confidence_score for m in matches) / len(matches)
+        avg_conf = match_stats['confidence'].mean()
         
         print("Confidence distribution:")
         print(f"  High (≥90%):  {high_conf:,}")
@@ -183,6 +204,7 @@ def main():
             print(f"Export complete in {export_time:.2f}s")
         except Exception as e:
             logger.error(f"Export failed: {e}")
+            logger.debug("Traceback:", exc_info=True)
             return 1
     else:
         print("No duplicates found.")
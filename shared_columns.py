@@ -0,0 +1,117 @@
+"""
+Shared Column Store for Worker Processes
+========================================
+
+DataFrame columns in multiprocessing.shared_memory, so pool workers read rows by
+position instead of unpickling a copy of every block. Used by the parallel paths of
+duplicate_checker_integration and duplicate_checker_optimized.
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Sequence, Tuple
+from multiprocessing import shared_memory
+
+# Missing values keep their kind (None / NaN / <NA> / NaT) - str() of them differs and
+# some address comparisons work on str(value)
+MISSING_VALUES = (None, np.nan, pd.NA, pd.NaT)
+
+def _missing_code(value) -> int:
+    """0 for present values, 1 + position in MISSING_VALUES for missing ones"""
+    if value is None:
+        return 1
+    if value is pd.NA:
+        return 3
+    if value is pd.NaT:
+        return 4
+    return 2 if pd.isna(value) else 0
+
+class SharedColumnStore:
+    """
+    Columns of a whole DataFrame in multiprocessing.shared_memory so worker
+    processes read them without pickling: numeric columns as raw arrays, text columns
+    as one UTF-8 buffer plus offsets and a missing-value code per row
+    """
+
+    def __init__(self, specs: Dict[str, Tuple], segments: List[shared_memory.SharedMemory]):
+        self.specs = specs
+        self.segments = segments
+
+    @staticmethod
+    def _to_shared(array: np.ndarray, segments: List[shared_memory.SharedMemory]) -> Tuple[str, str, Tuple[int, ...]]:
+        segment = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        segments.append(segment)
+        np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf)[...] = array
+        return segment.name, array.dtype.str, array.shape
+
+    @classmethod
+    def create(cls, df: pd.DataFrame, columns: Sequence[str]) -> 'SharedColumnStore':
+        """Copy the given columns (those present in df) into new shared memory segments"""
+        specs = {}
+        segments = []
+        try:
+            for column in columns:
+                if column not in df.columns:
+                    continue
+                values = df[column].to_numpy()
+                if values.dtype.kind in 'biuf':
+                    specs[column] = ('array', cls._to_shared(values, segments))
+                    continue
+                missing = np.fromiter((_missing_code(value) for value in values), dtype=np.int8, count=len(values))
+                encoded = [b'' if code else str(value).encode('utf-8')
+                           for value, code in zip(values, missing)]
+                offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+                np.cumsum([len(value) for value in encoded], out=offsets[1:])
+                specs[column] = ('text',
+                                 cls._to_shared(np.frombuffer(b''.join(encoded), dtype=np.uint8), segments),
+                                 cls._to_shared(offsets, segments),
+                                 cls._to_shared(missing, segments))
+        except Exception:
+            cls(specs, segments).release()
+            raise
+        return cls(specs, segments)
+
+    def release(self):
+        """Close and free the shared memory segments (owner side)"""
+        for segment in self.segments:
+            segment.close()
+            segment.unlink()
+        self.segments = []
+
+class SharedColumnReader:
+    """Worker-side view on a SharedColumnStore, attached once per process"""
+
+    def __init__(self, specs: Dict[str, Tuple]):
+        self.segments = []
+        self.columns = {}
+        for column, spec in specs.items():
+            arrays = [self._attach(array_spec) for array_spec in spec[1:]]
+            self.columns[column] = (spec[0], arrays)
+
+    def _attach(self, array_spec: Tuple[str, str, Tuple[int, ...]]) -> np.ndarray:
+        name, dtype, shape = array_spec
+        segment = shared_memory.SharedMemory(name=name)
+        self.segments.append(segment)
+        return np.ndarray(shape, dtype=np.dtype(dtype), buffer=segment.buf)
+
+    def block_columns(self, positions: np.ndarray) -> Dict[str, np.ndarray]:
+        """Column arrays for the given row positions (text columns as object arrays of str)"""
+        block = {}
+        for column, (kind, arrays) in self.columns.items():
+            if kind == 'array':
+                block[column] = arrays[0][positions]
+                continue
+            data, offsets, missing = arrays
+            values = np.empty(len(positions), dtype=object)
+            for k, position in enumerate(positions):
+                code = missing[position]
+                values[k] = MISSING_VALUES[code - 1] if code else \
+                    data[offsets[position]:offsets[position + 1]].tobytes().decode('utf-8')
+            block[column] = values
+        return block
+
+    def close(self):
+        """Detach from the shared memory segments (worker side)"""
+        for segment in self.segments:
+            segment.close()
+        self.segments = []
@@ -0,0 +1,54 @@
+"""
+Test Script for the Address Block Split
+=======================================
+
+Dense address blocks split by Name/Vorname initial must keep the matches the
+unsplit block finds: exact matches with a missing Name and Name/Vorname swaps.
+"""
+
+import string
+
+import numpy as np
+import pandas as pd
+import pytest
+
+integration = pytest.importorskip('duplicate_checker_integration')
+
+ADDRESS = {'Strasse': 'Hauptstrasse', 'HausNummer': '1', 'Plz': '8000', 'Ort': 'Zuerich', 'Name2': ''}
+MAX_BLOCK_SIZE = 10
+
+
+def dense_address_frame() -> pd.DataFrame:
+    # Fillers with distinct years never match each other but spread the initials
+    fillers = [{'Name': f'{letter}ammer', 'Vorname': f'{letter.lower()}elix', 'Geburtstag': f'{1900 + k}-01-01'}
+               for k, letter in enumerate(string.ascii_uppercase[1:])]
+    pairs = [
+        {'Name': 'Muster-Mann', 'Vorname': 'Anna', 'Geburtstag': '1980-05-01'},
+        {'Name': np.nan, 'Vorname': 'Anna', 'Geburtstag': '1980-05-01'},   # exact match, Name missing
+        {'Name': 'Gloor', 'Vorname': 'Anna', 'Geburtstag': '1970-03-03'},
+        {'Name': 'Mustermann', 'Vorname': 'Gloor', 'Geburtstag': '1970-03-03'},  # Name/Vorname swap
+    ]
+    return pd.DataFrame([{**ADDRESS, 'Jahrgang': None, **record} for record in fillers + pairs])
+
+
+def match_pairs(df: pd.DataFrame, max_block_size) -> dict:
+    checker = integration.OptimizedDuplicateChecker(fuzzy_threshold=0.7, max_block_size=max_block_size)
+    matches = checker.find_duplicates(df, confidence_threshold=60.0, use_parallel=False)
+    return {(match.record_a_idx, match.record_b_idx): match.match_type for match in matches}
+
+
+def test_split_keeps_missing_name_and_swapped_matches():
+    df = dense_address_frame()
+    assert len(integration.BlockingStrategy(max_block_size=MAX_BLOCK_SIZE).create_blocks(df)) > 1
+
+    unsplit = match_pairs(df, max_block_size=None)
+    split = match_pairs(df, max_block_size=MAX_BLOCK_SIZE)
+
+    first = len(df) - 4
+    assert unsplit[(first, first + 1)].startswith('exact')
+    assert unsplit[(first + 2, first + 3)] == 'fuzzy_swapped'
+    assert split == unsplit
+
+
+def test_split_is_opt_in():
+    assert integration.BlockingStrategy().max_block_size is None
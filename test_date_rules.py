@@ -0,0 +1,76 @@
+"""
+Test Script for the Date Business Rules
+=======================================
+
+Parametrized checks of BusinessRulesEngine's effective-year date rule,
+scalar and vectorized, in one module so the engine is imported once.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from duplicate_checker_poc import BusinessRulesEngine, MISSING_YEAR
+
+DATE_RULE_CASES = [
+    # geb_a, jg_a, geb_b, jg_b, expected
+    ('1980-01-15', None, '1980-01-15', None, True),      # Geburtstag on both, same date
+    ('1980-01-15', None, '1980-12-31', None, True),      # Geburtstag on both, same year is enough
+    ('1980-01-15', None, '1981-01-15', None, False),     # Geburtstag on both, different year
+    ('16.07.1963', None, None, '1963', True),            # Geburtstag vs. Jahrgang, same year
+    ('16.07.1963', None, None, '1964', False),           # Geburtstag vs. Jahrgang, different year
+    (None, '1998.0', None, '1998', True),                # Jahrgang on both (float string from SQL)
+    (None, 1998, None, 1999, False),                     # Jahrgang on both, different
+    ('16.07.1963', '1970', None, '1963', True),          # Jahrgang ignored when Geburtstag is set
+    ('16.07.1963', '1963', None, '1970', False),
+    (None, None, None, None, True),                      # No year information on either side
+    (None, None, '16.07.1963', None, False),             # Year information on one side only
+    ('', '', None, '1963', False),
+    (None, '0', None, None, False),                      # Jahrgang '0' is set (year 0), not missing
+    (None, '0', None, '0', False),                       # Year 0 never passes the date rule
+    (None, 0, None, None, True),                         # Numeric 0 counts as not set
+    (None, '-1', None, None, False),                     # Negative Jahrgang is a year, not the sentinel
+]
+
+
+@pytest.mark.parametrize('geb_a,jg_a,geb_b,jg_b,expected', DATE_RULE_CASES)
+def test_check_date_rule(geb_a, jg_a, geb_b, jg_b, expected):
+    year_a = BusinessRulesEngine.effective_year(geb_a, jg_a)
+    year_b = BusinessRulesEngine.effective_year(geb_b, jg_b)
+    assert BusinessRulesEngine.check_date_rule(year_a, year_b) == expected
+
+
+def test_effective_years_matches_scalar():
+    geburtstag = pd.Series([case[0] for case in DATE_RULE_CASES] + [case[2] for case in DATE_RULE_CASES])
+    jahrgang = pd.Series([case[1] for case in DATE_RULE_CASES] + [case[3] for case in DATE_RULE_CASES])
+
+    years = BusinessRulesEngine.effective_years(geburtstag, jahrgang)
+
+    assert years.dtype == np.int32
+    assert years.tolist() == [BusinessRulesEngine.effective_year(g, j) for g, j in zip(geburtstag, jahrgang)]
+
+
+def test_check_date_rules_batch():
+    years_a = BusinessRulesEngine.effective_years(pd.Series([case[0] for case in DATE_RULE_CASES]),
+                                                  pd.Series([case[1] for case in DATE_RULE_CASES]))
+    years_b = BusinessRulesEngine.effective_years(pd.Series([case[2] for case in DATE_RULE_CASES]),
+                                                  pd.Series([case[3] for case in DATE_RULE_CASES]))
+
+    assert BusinessRulesEngine.check_date_rules(years_a, years_b).tolist() == [case[4] for case in DATE_RULE_CASES]
+
+
+def test_date_rule_candidates():
+    years = np.array([1963, MISSING_YEAR, 1963, 1980, MISSING_YEAR, 1963], dtype=np.int32)
+
+    assert BusinessRulesEngine.date_rule_candidates(years, 0).tolist() == [2, 5]
+    assert BusinessRulesEngine.date_rule_candidates(years, 1).tolist() == [4]
+    assert BusinessRulesEngine.date_rule_candidates(years, 3).tolist() == []
+
+
+def test_effective_years_narrow_dtypes():
+    # Column dtypes as produced by data.verkleinere_dtypes
+    geburtstag = pd.Series(['16.07.1963', None, '1980-01-15', None], dtype='category')
+    jahrgang = pd.Series([1970, 1998, None, None], dtype='Int16')
+
+    years = BusinessRulesEngine.effective_years(geburtstag, jahrgang)
+
+    assert years.tolist() == [1963, 1998, 1980, MISSING_YEAR]
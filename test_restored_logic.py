@@ -7,14 +7,34 @@ and verifies all business rules are working correctly.
 """
 
 import pandas as pd
+import numpy as np
+import pytest
+from functools import lru_cache
+from typing import List, Optional
+from dataclasses import dataclass, field
 from duplicate_checker_optimized import UltraFastDuplicateChecker
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def create_comprehensive_test_data() -> pd.DataFrame:
-    """Create comprehensive test data covering all scenarios"""
+# Failure messages kept per verification run (the failed count stays exact)
+MAX_REPORTED_FAILURES = 100
+
+# Repeated text columns as category, like data.verkleinere_dtypes does for the SQL data
+CATEGORY_COLUMNS = ('Name', 'Vorname', 'Name2', 'Strasse', 'Ort')
+
+@dataclass
+class VerifyResults:
+    """Outcome of verify_match_expectations"""
+    total_tests: int
+    passed: int
+    failed: int
+    failures: List[str] = field(default_factory=list)
+
+@lru_cache(maxsize=None)
+def _comprehensive_test_frame() -> pd.DataFrame:
+    """Test data built once per process (create_comprehensive_test_data hands out copies)"""
     
     test_cases = [
         # Test 1 & 2: Exact normal match (should be 90-100% confidence, exact_normal)
@@ -422,77 +442,80 @@ def create_comprehensive_test_data() -> pd.DataFrame:
         },
     ]
     
-    return pd.DataFrame(test_cases)
+    return pd.DataFrame(test_cases).astype({column: 'category' for column in CATEGORY_COLUMNS})
 
-def verify_match_expectations(matches, expected_matches):
+def create_comprehensive_test_data() -> pd.DataFrame:
+    """Create comprehensive test data covering all scenarios"""
+    return _comprehensive_test_frame().copy()
+
+@lru_cache(maxsize=None)
+def get_checker() -> UltraFastDuplicateChecker:
+    """Checker of the test run, created once per process (it keeps no state between analyses)"""
+    # Higher threshold to test phonetic fallback
+    # Phonetic fallback works for 60-75% similarity range
+    return UltraFastDuplicateChecker(fuzzy_threshold=0.75, use_parallel=False)
+
+def verify_match_expectations(matches, expected_matches) -> VerifyResults:
     """Verify that matches meet expectations"""
     
-    results = {
-        'total_tests': len(expected_matches),
-        'passed': 0,
-        'failed': 0,
-        'failures': []
-    }
-    
-    # Create lookup for actual matches
-    actual_match_types = {}
-    actual_confidences = {}
+    # Actual matches as one frame, joined to the expectations on the index pair
+    # (the last match wins if a pair occurs twice)
+    actual = pd.DataFrame({
+        'idx_a': np.array([match.record_a_idx for match in matches], dtype=np.int64),
+        'idx_b': np.array([match.record_b_idx for match in matches], dtype=np.int64),
+        'actual_type': pd.Series([match.match_type for match in matches], dtype=object),
+        'actual_conf': np.array([match.confidence_score for match in matches], dtype=np.float64),
+    }).drop_duplicates(['idx_a', 'idx_b'], keep='last')
+    merged = pd.DataFrame(expected_matches).merge(actual, on=['idx_a', 'idx_b'], how='left')
     
-    for match in matches:
-        key = (match.record_a_idx, match.record_b_idx)
-        actual_match_types[key] = match.match_type
-        actual_confidences[key] = match.confidence_score
+    found = merged['actual_type'].notna()
+    type_ok = merged['actual_type'] == merged['match_type']
+    conf_ok = merged['actual_conf'].between(merged['confidence_min'], merged['confidence_max'])
+    passed = np.where(merged['should_match'].astype(bool), found & type_ok & conf_ok, ~found)
+    results = VerifyResults(total_tests=len(expected_matches), passed=int(passed.sum()), failed=int((~passed).sum()))
     
-    # Check expectations
-    for expected in expected_matches:
-        test_name = expected['test_name']
-        idx_pair = (expected['idx_a'], expected['idx_b'])
-        expected_type = expected['match_type']
-        expected_conf_min = expected['confidence_min']
-        expected_conf_max = expected['confidence_max']
-        should_match = expected['should_match']
+    # Messages per expectation, logged with one call per level at the end; PASS lines are
+    # only formatted if INFO is enabled
+    log_passes = logger.isEnabledFor(logging.INFO)
+    pass_lines = []
+    for expected, was_found, ok in zip(merged.itertuples(index=False), found, passed):
+        test_name = expected.test_name
+        actual_type = expected.actual_type
+        actual_conf = expected.actual_conf
         
-        if should_match:
-            if idx_pair in actual_match_types:
-                actual_type = actual_match_types[idx_pair]
-                actual_conf = actual_confidences[idx_pair]
-                
-                # Check match type
-                type_ok = (actual_type == expected_type)
-                
-                # Check confidence range
-                conf_ok = (expected_conf_min <= actual_conf <= expected_conf_max)
-                
-                if type_ok and conf_ok:
-                    results['passed'] += 1
-                    logger.info(f"✓ PASS: {test_name} - {actual_type} @ {actual_conf:.1f}%")
-                else:
-                    results['failed'] += 1
-                    failure_msg = f"✗ FAIL: {test_name} - Expected {expected_type} ({expected_conf_min}-{expected_conf_max}%), got {actual_type} @ {actual_conf:.1f}%"
-                    results['failures'].append(failure_msg)
-                    logger.error(failure_msg)
+        if expected.should_match:
+            if ok:
+                if log_passes:
+                    pass_lines.append(f"✓ PASS: {test_name} - {actual_type} @ {actual_conf:.1f}%")
+                continue
+            if was_found:
+                failure_msg = (f"✗ FAIL: {test_name} - Expected {expected.match_type} "
+                               f"({expected.confidence_min}-{expected.confidence_max}%), "
+                               f"got {actual_type} @ {actual_conf:.1f}%")
             else:
-                results['failed'] += 1
                 failure_msg = f"✗ FAIL: {test_name} - Expected match but none found"
-                results['failures'].append(failure_msg)
-                logger.error(failure_msg)
         else:
             # Should NOT match
-            if idx_pair not in actual_match_types:
-                results['passed'] += 1
-                logger.info(f"✓ PASS: {test_name} - Correctly rejected")
-            else:
-                results['failed'] += 1
-                actual_type = actual_match_types[idx_pair]
-                actual_conf = actual_confidences[idx_pair]
-                failure_msg = f"✗ FAIL: {test_name} - Should not match but found {actual_type} @ {actual_conf:.1f}%"
-                results['failures'].append(failure_msg)
-                logger.error(failure_msg)
+            if ok:
+                if log_passes:
+                    pass_lines.append(f"✓ PASS: {test_name} - Correctly rejected")
+                continue
+            failure_msg = f"✗ FAIL: {test_name} - Should not match but found {actual_type} @ {actual_conf:.1f}%"
+        if len(results.failures) < MAX_REPORTED_FAILURES:
+            results.failures.append(failure_msg)
+    
+    if pass_lines:
+        logger.info("Expectations met:\n%s", "\n".join(pass_lines))
+    if results.failures:
+        logger.error("Expectations failed:\n%s", "\n".join(results.failures))
     
     return results
 
-def main():
-    """Run comprehensive tests"""
+def main(checker: Optional[UltraFastDuplicateChecker] = None, export_csv: bool = True):
+    """
+    Run comprehensive tests (with the given checker or the one of get_checker);
+    export_csv=False skips writing test_results.csv
+    """
     
     print("=" * 80)
     print("Testing Restored Business Logic - Two-Stage Architecture")
@@ -526,9 +549,7 @@ def main():
         {'test_name': 'Wagner/Vagner swapped (high similarity)', 'idx_a': 28, 'idx_b': 29, 'match_type': 'fuzzy_swapped', 'confidence_min': 70, 'confidence_max': 85, 'should_match': True},
     ]
     
-    # Initialize checker with higher threshold to test phonetic fallback
-    # Phonetic fallback works for 60-75% similarity range
-    checker = UltraFastDuplicateChecker(fuzzy_threshold=0.75, use_parallel=False)
+    checker = checker or get_checker()
     
     # Run analysis
     print("Running duplicate analysis...")
@@ -542,10 +563,11 @@ def main():
     print("=" * 80)
     print("All Detected Matches")
     print("=" * 80)
-    for i, match in enumerate(matches, 1):
-        record_a = df.iloc[match.record_a_idx]
-        record_b = df.iloc[match.record_b_idx]
-        
+    # Displayed columns of all A and B records in one positional take per side
+    view = df[['Vorname', 'Name', 'TestCase']]
+    records_a = view.take([match.record_a_idx for match in matches]).to_dict('records')
+    records_b = view.take([match.record_b_idx for match in matches]).to_dict('records')
+    for i, (match, record_a, record_b) in enumerate(zip(matches, records_a, records_b), 1):
         print(f"\nMatch {i}: {match.match_type.upper()} (Confidence: {match.confidence_score:.1f}%)")
         print(f"  A [{match.record_a_idx}]: {record_a['Vorname']} {record_a['Name']} - {record_a['TestCase']}")
         print(f"  B [{match.record_b_idx}]: {record_b['Vorname']} {record_b['Name']} - {record_b['TestCase']}")
@@ -563,28 +585,36 @@ def main():
     print("=" * 80)
     print("Summary")
     print("=" * 80)
-    print(f"Total Tests: {results['total_tests']}")
-    print(f"Passed: {results['passed']}")
-    print(f"Failed: {results['failed']}")
-    print(f"Success Rate: {results['passed']/results['total_tests']*100:.1f}%")
+    print(f"Total Tests: {results.total_tests}")
+    print(f"Passed: {results.passed}")
+    print(f"Failed: {results.failed}")
+    print(f"Success Rate: {results.passed/results.total_tests*100:.1f}%")
     
-    if results['failed'] > 0:
+    if results.failed > 0:
         print()
         print("Failed Tests:")
-        for failure in results['failures']:
+        for failure in results.failures:
             print(f"  {failure}")
     
     print()
     
     # Export results for inspection
-    if matches:
+    if matches and export_csv:
         checker.export_results(matches, df, 'test_results.csv')
         print("Results exported to test_results.csv")
     
     print()
     print("=" * 80)
     
-    return results['failed'] == 0
+    return results.failed == 0
+
+@pytest.fixture(scope="session")
+def checker() -> UltraFastDuplicateChecker:
+    """One checker for all tests of the session"""
+    return get_checker()
+
+def test_restored_business_logic(checker):
+    assert main(checker, export_csv=False)
 
 if __name__ == "__main__":
     success = main()